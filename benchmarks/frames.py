@@ -0,0 +1,55 @@
+"""
+Compare converting a `Cycler` to a data frame through its columns with the
+list-of-dicts route.
+
+Usage::
+
+    python benchmarks/frames.py [--size N] [--repeat R]
+
+Requires pandas; the pyarrow rows are skipped if it is not installed.
+"""
+
+import argparse
+import timeit
+
+from cycler import cycler
+
+
+def make_cycler(size):
+    # A product of a few keys with about *size* rows.
+    side = max(int(round(size ** (1 / 3))), 1)
+    return (cycler(color=[f"C{i}" for i in range(side)])
+            * (cycler(lw=range(side)) + cycler(ls=["-", "--", ":"] * side)[:side])
+            * cycler(alpha=[i / side for i in range(side)]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    cc = make_cycler(args.size)
+    cases = {
+        "pd.DataFrame(list(cc))": lambda: pd.DataFrame(list(cc)),
+        "cc.to_pandas()": cc.to_pandas,
+    }
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pass
+    else:
+        cases["pa.Table.from_pylist(list(cc))"] = (
+            lambda: pa.Table.from_pylist(list(cc)))
+        cases["cc.to_arrow()"] = cc.to_arrow
+
+    print(f"{len(cc)} rows, {len(cc.keys)} keys")
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        print(f"  {name:34s} {best * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
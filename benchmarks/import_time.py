@@ -0,0 +1,85 @@
+"""
+Measure the start-up cost of ``import cycler`` using ``python -X importtime``.
+
+Each sample runs a fresh interpreter, so the numbers include everything
+``import cycler`` pulls in that the bare interpreter has not already loaded.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat N] [--budget-ms MS]
+
+With ``--budget-ms`` the script exits with a non-zero status when the median
+cumulative import time of `cycler` exceeds the budget.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_profile(module="cycler"):
+    """
+    Import *module* in a fresh interpreter and parse the ``-X importtime`` log.
+
+    Returns
+    -------
+    cumulative : int
+        Cumulative import time of *module* in microseconds.
+    imported : dict
+        Map of every module imported by *module* (including itself) to its
+        self time in microseconds.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    imported = {}
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        imported[name] = int(self_us)
+        if name == module:
+            cumulative = int(cumulative_us)
+    if cumulative is None:
+        raise RuntimeError(f"{module} was already imported at start-up")
+    # Modules imported by the bare interpreter are listed before the target's
+    # own imports; keep only those in the target's import subtree.
+    baseline = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True, text=True, check=True,
+    )
+    for line in baseline.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            imported.pop(line.rsplit("|", 1)[1].strip(), None)
+    return cumulative, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=11)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    samples = []
+    for _ in range(args.repeat):
+        cumulative, imported = import_profile()
+        samples.append(cumulative)
+    median_ms = statistics.median(samples) / 1000
+    print(f"import cycler: median {median_ms:.2f} ms "
+          f"(min {min(samples) / 1000:.2f} ms, {args.repeat} runs)")
+    print("modules imported:")
+    for name, self_us in sorted(imported.items(), key=lambda kv: -kv[1]):
+        print(f"  {name:30s} {self_us / 1000:8.2f} ms")
+
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"FAIL: {median_ms:.2f} ms exceeds budget of {args.budget_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
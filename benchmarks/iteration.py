@@ -0,0 +1,78 @@
+"""
+Compare the rows per second of iterating over a `Cycler` with itertools
+pipelines with those of a generator at every node of the tree.
+
+Usage::
+
+    python benchmarks/iteration.py [--size N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from cycler import Cycler, cycler
+
+
+def row_by_row(cc):
+    # The rows of *cc* from a generator at every node of the tree.
+    if cc._is_view():
+        yield from map(cc._left._row, cc._op)
+    elif cc._right is None:
+        rows = row_by_row(cc._left) if isinstance(cc._left, Cycler) else cc._left
+        for row in rows:
+            yield dict(row)
+    else:
+        for a, b in cc._op(row_by_row(cc._left), row_by_row(cc._right)):
+            out = {}
+            out.update(a)
+            out.update(b)
+            yield out
+
+
+def make_deep(size, depth=6):
+    # A product of *depth* leaves with about *size* rows.
+    side = max(int(round(size ** (1 / depth))), 1)
+    cc = cycler(k0=range(side))
+    for i in range(1, depth):
+        cc = cc * cycler(f"k{i}", range(side))
+    return cc
+
+
+def make_wide(size, width=16):
+    # A sum of *width* leaves of *size* rows.
+    cc = cycler(k0=range(size))
+    for i in range(1, width):
+        cc = cc + cycler(f"k{i}", [f"v{j}" for j in range(size)])
+    return cc
+
+
+def make_tiled(size):
+    # Integer multiplication of a small product.
+    base = cycler(color="rgbcmyk") * cycler(lw=[0.5, 1, 1.5, 2])
+    return base * max(size // len(base), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    trees = {
+        "deep": make_deep(args.size),
+        "wide": make_wide(args.size),
+        "tiled": make_tiled(args.size),
+    }
+    for name, cc in trees.items():
+        print(f"{name}: {len(cc)} rows, {len(cc.keys)} keys")
+        cases = {
+            "list(cc)": lambda: list(cc),
+            "list(row_by_row(cc))": lambda: list(row_by_row(cc)),
+        }
+        for case, func in cases.items():
+            best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print(f"  {case:24s} {len(cc) / best:14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
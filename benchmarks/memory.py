@@ -0,0 +1,153 @@
+"""
+Measure the peak and retained memory of `Cycler` operations with tracemalloc.
+
+Each case builds its input, then measures one operation: *peak* is the
+largest amount of memory allocated at any point during the operation and
+*retained* what is still allocated once it returns, while its result is
+alive.  Both are relative to the memory in use before the operation.
+
+Usage::
+
+    python benchmarks/memory.py [--sizes N [N ...]] [--cases NAME ...]
+                                [--save FILE] [--compare FILE]
+                                [--threshold FRACTION]
+
+``--save`` stores the measurements as a JSON baseline, and ``--compare``
+checks them against one, exiting with a non-zero status if any number grew by
+more than the threshold (10% by default, ignoring growth under 4 kB).
+``benchmarks/memory_baseline.json`` holds the baseline for the default
+sizes; tracemalloc numbers depend on the Python version, so regenerate it
+when comparing on a different one.
+"""
+
+import argparse
+from collections import deque
+import gc
+from itertools import islice
+import json
+import sys
+import tracemalloc
+
+from cycler import cycler
+
+
+def _leaf(n, key="c"):
+    return cycler(key, range(n))
+
+
+def _product(n):
+    # A product of three keys with about *n* rows.
+    side = max(round(n ** (1 / 3)), 1)
+    return (cycler(color=[f"C{i}" for i in range(side)])
+            * cycler(lw=range(side)) * cycler(alpha=[i / side for i in range(side)]))
+
+
+# name: (setup(n) -> input, operation(input) -> result)
+CASES = {
+    "construct-range": (lambda n: range(n), lambda r: cycler(c=r)),
+    "construct-repetitive": (lambda n: ["r", "g", "b"] * (n // 3),
+                             lambda v: cycler(c=v)),
+    "compose-zip": (lambda n: (_leaf(n, "a"), _leaf(n, "b")),
+                    lambda ab: ab[0] + ab[1]),
+    "compose-product": (lambda n: (_leaf(round(n ** 0.5), "a"),
+                                   _leaf(round(n ** 0.5), "b")),
+                        lambda ab: ab[0] * ab[1]),
+    "iterate": (_product, lambda c: deque(c, maxlen=0)),
+    "list": (_product, list),
+    "by_key": (_product, lambda c: c.by_key()),
+    "slice": (_product, lambda c: c[1::2]),
+    "roll": (_product, lambda c: c.roll(3)),
+    "repr": (_product, repr),
+    "repr_html": (_product, lambda c: c._repr_html_()),
+    "cycle": (_product, lambda c: deque(islice(c(), 2 * len(c)), maxlen=0)),
+    "shared_cycle": (_product,
+                     lambda c: deque(islice(c.shared_cycle(), 2 * len(c)), maxlen=0)),
+}
+
+
+def measure(setup, operation, n):
+    """Return the (peak, retained) bytes of ``operation(setup(n))``."""
+    # Once beforehand, for the modules and caches loaded on first use.
+    operation(setup(min(n, 10)))
+    data = setup(n)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        # Python 3.8 has no reset_peak(); its peaks then also count the few
+        # allocations made since start().
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        result = operation(data)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - before, current - before
+
+
+def run(cases, sizes):
+    return {
+        name: {str(n): dict(zip(("peak", "retained"), measure(*CASES[name], n)))
+               for n in sizes}
+        for name in cases
+    }
+
+
+def _format(n):
+    for unit in ("B", "kB", "MB"):
+        if abs(n) < 1000 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1000
+
+
+def compare(results, baseline, threshold, slack=4000):
+    """Print the changes from *baseline*; return whether none regressed."""
+    ok = True
+    for name, by_size in results.items():
+        for size, numbers in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            for what, value in numbers.items():
+                limit = max(base[what] * (1 + threshold), base[what] + slack)
+                if value > limit:
+                    ok = False
+                    print(f"REGRESSION {name} n={size} {what}: "
+                          f"{_format(base[what])} -> {_format(value)}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--save", metavar="FILE")
+    parser.add_argument("--compare", metavar="FILE")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, args.sizes)
+    print(f"{'case':22s}{'n':>9s}{'peak':>12s}{'retained':>12s}")
+    for name, by_size in results.items():
+        for size, numbers in by_size.items():
+            print(f"{name:22s}{size:>9s}{_format(numbers['peak']):>12s}"
+                  f"{_format(numbers['retained']):>12s}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results},
+                      f, indent=1, sort_keys=True)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["python"].split(".")[:2] != sys.version.split(".")[:2]:
+            print(f"warning: baseline made with Python {baseline['python']}")
+        if not compare(results, baseline["results"], args.threshold):
+            sys.exit(1)
+        print(f"no regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
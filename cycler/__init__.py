@@ -43,26 +43,69 @@ Results in::
 
 from __future__ import annotations
 
-from collections.abc import Hashable, Iterable, Generator
-import copy
-from functools import reduce
-from itertools import product, cycle
-from operator import mul, add
-# Dict, List, Union required for runtime cast calls
-from typing import TypeVar, Generic, Callable, Union, Dict, List, Any, overload, cast
+from itertools import chain, cycle, islice, product, repeat, starmap
+from operator import itemgetter, mul
+import os
+
+# Only type checkers need the generic machinery.  Importing `typing` (and
+# `collections.abc`) roughly doubles the cost of ``import cycler``, so it is
+# kept out of the runtime path; ``TYPE_CHECKING`` is treated as true by
+# type checkers regardless of where it is defined.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterator, Awaitable, Callable, Generator, Hashable, Iterable,
+        Iterator, Mapping)
+    from typing import Any, Generic, TypeVar, overload
+
+    from ._columns import _ColumnRows
+
+    K = TypeVar("K", bound=Hashable)
+    L = TypeVar("L", bound=Hashable)
+    V = TypeVar("V")
+    U = TypeVar("U")
+else:
+    K = L = V = U = None
+
+    def overload(func):
+        return func
+
+    class Generic:
+        """Runtime stand-in for `typing.Generic`; ``Cycler[K, V]`` is `Cycler`."""
+
+        def __class_getitem__(cls, params):
+            return cls
 
 
 __version__ = "0.13.0.dev0"
 
-K = TypeVar("K", bound=Hashable)
-L = TypeVar("L", bound=Hashable)
-V = TypeVar("V")
-U = TypeVar("U")
+# Whether new cyclers are interned, see `set_interning`.
+_interning = False
+
+
+def _sum(cyclers: Iterable[Cycler[K, V]]) -> Cycler[K, V]:
+    r"""
+    Add up `Cycler`\s, equivalent to ``functools.reduce(operator.add, cyclers)``.
+    """
+    it = iter(cyclers)
+    total = next(it)
+    for c in it:
+        total = total + c
+    return total
+
+
+def _union(a: dict[K, V], b: dict[K, V]) -> dict[K, V]:
+    """``a | b``, for Python 3.8 which has no `dict.__or__`."""
+    return {**a, **b}
+
+
+# A new dict with the items of two rows; `dict.__or__` runs no Python code.
+_merge_rows = getattr(dict, "__or__", _union)
 
 
 def _process_keys(
     left: Cycler[K, V] | Iterable[dict[K, V]],
-    right: Cycler[K, V] | Iterable[dict[K, V]] | None,
+    right: Cycler[K, V] | None,
 ) -> set[K]:
     """
     Helper function to compose cycler keys.
@@ -77,10 +120,12 @@ def _process_keys(
     keys : set
         The keys in the composition of the two cyclers.
     """
-    l_peek: dict[K, V] = next(iter(left)) if left != [] else {}
-    r_peek: dict[K, V] = next(iter(right)) if right is not None else {}
-    l_key: set[K] = set(l_peek.keys())
-    r_key: set[K] = set(r_peek.keys())
+    if isinstance(left, Cycler):
+        l_key: set[K] = left.keys
+    else:
+        l_peek: dict[K, V] = next(iter(left)) if left != [] else {}
+        l_key = set(l_peek.keys())
+    r_key: set[K] = right.keys if right is not None else set()
     if common_keys := l_key & r_key:
         raise ValueError(
             f"Cannot compose overlapping cycles, duplicate key(s): {common_keys}"
@@ -115,9 +160,9 @@ def concat(left: Cycler[K, V], right: Cycler[K, U]) -> Cycler[K, V | U]:
                 both=left.keys & right.keys, just_one=left.keys ^ right.keys
             )
         )
-    _l = cast(Dict[K, List[Union[V, U]]], left.by_key())
-    _r = cast(Dict[K, List[Union[V, U]]], right.by_key())
-    return reduce(add, (_cycler(k, _l[k] + _r[k]) for k in left.keys))
+    _l: dict[K, list[V | U]] = left.by_key()  # type: ignore[assignment]
+    _r: dict[K, list[V | U]] = right.by_key()  # type: ignore[assignment]
+    return _sum(_cycler(k, _l[k] + _r[k]) for k in left.keys)
 
 
 class Cycler(Generic[K, V]):
@@ -138,7 +183,7 @@ class Cycler(Generic[K, V]):
     ``*=``
       in-place ``*``
 
-    and supports basic slicing via ``[]``.
+    and supports basic slicing and column access via ``[]``.
 
     Parameters
     ----------
@@ -148,6 +193,10 @@ class Cycler(Generic[K, V]):
         Function which composes the 'left' and 'right' cyclers.
     """
 
+    # The leaf rows, their keys and the positions of each tuple of values
+    # (None if they are unhashable), see `_leaf_positions`.
+    _value_index: tuple[Any, tuple, dict[tuple, list[int]] | None]
+
     def __call__(self):
         return cycle(self)
 
@@ -162,21 +211,24 @@ class Cycler(Generic[K, V]):
 
         Do not use this directly, use `cycler` function instead.
         """
+        if (isinstance(right, Cycler) and left is not None
+                and not isinstance(left, Cycler)):
+            # Keep both operands of a composition as Cycler nodes.
+            left = Cycler(left)
+
+        # A Cycler, or the rows of a leaf: a list of dicts or a _ColumnRows.
+        self._left: Any
         if isinstance(left, Cycler):
-            self._left: Cycler[K, V] | list[dict[K, V]] = Cycler(
-                left._left, left._right, left._op
-            )
+            self._left = left._shallow_copy()
         elif left is not None:
             # Need to copy the dictionary or else that will be a residual
             # mutable that could lead to strange errors
-            self._left = [copy.copy(v) for v in left]
+            self._left = [dict(v) for v in left]
         else:
             self._left = []
 
         if isinstance(right, Cycler):
-            self._right: Cycler[K, V] | None = Cycler(
-                right._left, right._right, right._op
-            )
+            self._right: Cycler[K, V] | None = right._shallow_copy()
         else:
             self._right = None
 
@@ -184,6 +236,13 @@ class Cycler(Generic[K, V]):
         self._op: Any = op
 
     def __contains__(self, k):
+        """
+        Whether *k* is a key of the cycler or, if *k* is a `dict`, a row.
+        """
+        if isinstance(k, dict):
+            from ._search import first_position
+
+            return first_position(self, k) is not None
         return k in self._keys
 
     @property
@@ -214,18 +273,140 @@ class Cycler(Generic[K, V]):
         self._keys.remove(old)
         self._keys.add(new)
 
+        # The nodes and leaf storage below this one may be shared with other
+        # cyclers (see `_shallow_copy`), so they are replaced by renamed
+        # copies instead of being modified.
         if self._right is not None and old in self._right.keys:
-            self._right.change_key(old, new)
+            self._right = self._right._renamed(old, new)
 
         # self._left should always be non-None
         # if self._keys is non-empty.
         elif isinstance(self._left, Cycler):
-            self._left.change_key(old, new)
+            self._left = self._left._renamed(old, new)
+        elif hasattr(self._left, "renamed"):
+            # Column storage, see cycler._columns.
+            self._left = self._left.renamed(old, new)
         else:
             # It should be completely safe at this point to
             # assume that the old key can be found in each
             # iteration.
-            self._left = [{new: entry[old]} for entry in self._left]
+            self._left = [
+                {(new if k == old else k): v for k, v in entry.items()}
+                for entry in self._left
+            ]
+
+    def _renamed(self, old: K, new: K) -> Cycler[K, V]:
+        """Copy of this cycler with the key *old* renamed to *new*."""
+        ret = self._shallow_copy()
+        ret.change_key(old, new)
+        return ret
+
+    def append(self, row: dict[K, V]) -> None:
+        """
+        Add *row* at the end of the cycler, in place.
+
+        See `Cycler.extend`.
+        """
+        self.extend([row])
+
+    def extend(self, rows: Iterable[dict[K, V]]) -> None:
+        """
+        Add *rows* at the end of the cycler, in place.
+
+        Only cyclers made of leaves and additions (zips) of equal length
+        cyclers can be extended.  The values are appended to the columns of
+        the leaves: the first time a cycler is extended it makes its own
+        copy of the columns it shares with other cyclers (its copies and
+        the cyclers it is part of, which are not modified), after which
+        extending is O(1) per value.
+
+        Parameters
+        ----------
+        rows : iterable of dict
+            The rows to add, each with exactly the keys of the cycler.  A
+            `Cycler` with the same keys works.
+
+        Examples
+        --------
+        >>> cc = cycler(color='rg') + cycler(lw=[1, 2])
+        >>> cc.append({'color': 'b', 'lw': 3})
+        >>> cc
+        (cycler('color', ['r', 'g', 'b']) + cycler('lw', [1, 2, 3]))
+
+        Raises
+        ------
+        ValueError
+            If the cycler cannot be extended, or if the keys of a row are
+            not the keys of the cycler.
+        """
+        if not self._extendable():
+            raise ValueError(
+                "Can only extend leaf cyclers and sums of equal length cyclers"
+            )
+        rows = list(rows)
+        for row in rows:
+            if row.keys() != self._keys:
+                raise ValueError(
+                    f"Keys of {row!r} do not match the cycler keys {self._keys}"
+                )
+        if rows:
+            self._extend({k: [row[k] for row in rows] for k in self._keys})
+
+    def _extendable(self) -> bool:
+        if self._is_view():
+            return False
+        if self._right is None:
+            return not isinstance(self._left, Cycler) or self._left._extendable()
+        return (self._op is zip and len(self._left) == len(self._right)
+                and self._left._extendable() and self._right._extendable())
+
+    def _extend(self, columns: dict[K, list[V]]) -> None:
+        """Append the values in *columns*, a list for each key, see `extend`."""
+        if not self.__dict__.get("_owns_parts"):
+            self._own_parts()
+        if self._right is not None:
+            self._left._extend(columns)
+            self._right._extend(columns)
+            return
+        if isinstance(self._left, Cycler):
+            self._left._extend(columns)
+            return
+        n = len(self._left)
+        if hasattr(self._left, "column"):
+            for key in self._left.keys:
+                self._left.column(key).extend(columns[key])
+        else:
+            keys = tuple(self._keys)
+            self._left.extend(dict(zip(keys, values))
+                              for values in zip(*(columns[k] for k in keys)))
+        # Keep the index of the values up to date rather than rebuilding it.
+        cache = self.__dict__.get("_value_index")
+        if cache is not None and cache[0] is self._left and cache[2] is not None:
+            _, keys, index = cache
+            new = zip(*(columns[k] for k in keys))
+            try:
+                for i, values in enumerate(new, n):
+                    index.setdefault(values, []).append(i)
+            except TypeError:  # unhashable values
+                self._value_index = (self._left, keys, None)
+
+    def _own_parts(self) -> None:
+        """
+        Replace the parts of this node, which may be shared, by copies that
+        only it uses and that `_extend` can therefore modify.
+        """
+        if isinstance(self._left, Cycler):
+            self._left = self._left._shallow_copy()
+            if self._right is not None:
+                self._right = self._right._shallow_copy()
+        elif hasattr(self._left, "column"):
+            from ._columns import _ColumnRows
+
+            self._left = _ColumnRows(
+                self._left.keys, [list(c) for c in self._left.columns])
+        else:
+            self._left = list(self._left)
+        self._owns_parts = True
 
     @classmethod
     def _from_iter(cls, label: K, itr: Iterable[V]) -> Cycler[K, V]:
@@ -246,24 +427,857 @@ class Cycler(Generic[K, V]):
         -------
         `Cycler`
             New 'base' cycler.
+
+        Notes
+        -----
+        The values are stored as a column, which is dictionary or run-length
+        encoded when that takes much less memory than a list.
         """
+        from ._columns import _ColumnRows, _encode
+
         ret: Cycler[K, V] = cls(None)
-        ret._left = list({label: v} for v in itr)
+        ret._left = _ColumnRows((label,), (_encode(list(itr)),))
         ret._keys = {label}
+        return _interned(ret)
+
+    @classmethod
+    def _from_parts(
+        cls,
+        left: Cycler[K, V] | list[dict[K, V]] | _ColumnRows,
+        right: Cycler[K, V] | None,
+        op: Any,
+        keys: set[K],
+    ) -> Cycler[K, V]:
+        """
+        Class method to assemble a Cycler node from existing parts.
+
+        Unlike ``__init__`` the parts are used as they are; like all the
+        parts of a `Cycler` they may be shared but must never be modified.
+
+        Parameters
+        ----------
+        left, right, op :
+            The parts of the node, see `Cycler`.  A view node has a `Cycler`
+            as *left*, no *right* and a sequence of row indices into *left*
+            as *op*.
+        keys : set
+            The keys of the node.
+
+        Returns
+        -------
+        `Cycler`
+        """
+        ret: Cycler[K, V] = cls(None)
+        ret._left = left
+        ret._right = right
+        ret._op = op
+        ret._keys = set(keys)
         return ret
 
+    def _is_view(self) -> bool:
+        return self._right is None and self._op is not None
+
+    def _view(self, index: Any) -> Cycler[K, V]:
+        """
+        Return a view of the rows of this cycler at the positions in *index*.
+
+        This cycler becomes part of the view, so it must not be modified
+        afterwards.
+        """
+        return Cycler._from_parts(self, None, index, self._keys)
+
+    def _sliced(self, key: slice) -> Cycler[K, V]:
+        """View of the rows in the slice *key*; slices of slices are merged."""
+        if self._is_view() and type(self._op) is range:
+            return self._left._view(self._op[key])
+        return self._shallow_copy()._view(range(len(self))[key])
+
+    def __reversed__(self) -> Iterator[dict[K, V]]:
+        return iter(self[::-1])
+
+    def roll(self, k: int) -> Cycler[K, V]:
+        """
+        Rotate the rows by *k* positions, like `numpy.roll`.
+
+        Row ``i`` of the result is row ``(i - k) % len(self)``, so ``roll(1)``
+        moves the last row first and ``roll(-k)`` starts at row ``k``.  The
+        result is a view, created in O(1).
+
+        Examples
+        --------
+        >>> cycler(c='rgbk').roll(-1)
+        cycler('c', ['g', 'b', 'k', 'r'])
+        """
+        n = len(self)
+        return self.window(-k, n - k)
+
+    def step(self, n: int) -> Cycler[K, V]:
+        """
+        Every *n*-th row, starting from the first (or, for negative *n*, from
+        the last); equivalent to ``self[::n]``.
+        """
+        if n == 0:
+            raise ValueError("step must not be zero")
+        return self[::n]
+
+    def window(self, start: int, stop: int) -> Cycler[K, V]:
+        """
+        The rows from *start* to *stop* of the infinite cycle over the rows.
+
+        Equivalent to ``itertools.islice(self(), start, stop)``, allowing
+        negative positions (counted backwards from the start of the cycle)
+        and windows longer than the cycler.  The result is a view, created
+        in O(1).
+
+        Examples
+        --------
+        >>> cycler(c='rgb').window(2, 7)
+        cycler('c', ['b', 'r', 'g', 'b', 'r'])
+        """
+        n = len(self)
+        stop = max(stop, start)
+        if not n:
+            return self._sliced(slice(0, 0))
+        # Shift to the first period of the cycle.
+        shift = start // n * n
+        start, stop = start - shift, stop - shift
+        if stop <= n:
+            return self._sliced(slice(start, stop))
+        from ._views import _Radix
+
+        return self._shallow_copy()._view(_Radix(stop, 1, n))._sliced(
+            slice(start, stop))
+
+    def _shallow_copy(self) -> Cycler[K, V]:
+        """
+        Return a new `Cycler` sharing this cycler's parts, like `copy.copy`.
+
+        This is how cyclers are copied: the operations that modify a `Cycler`
+        in place (`change_key`, ``+=``, ``*=``) only ever replace its own
+        parts, never modify them, so sharing them is safe and copying is O(1).
+        `extend` only modifies parts that no other cycler uses.
+        """
+        ret: Cycler[K, V] = Cycler(None)
+        # The parts are shared from now on, see `_own_parts`.
+        self.__dict__.pop("_owns_parts", None)
+        ret.__dict__.update(self.__dict__)
+        ret._keys = set(self._keys)
+        return ret
+
+    __copy__ = _shallow_copy
+
+    @overload
     def __getitem__(self, key: slice) -> Cycler[K, V]:
+        ...
+
+    @overload
+    def __getitem__(self, key: K) -> list[V]:  # noqa: F811
+        ...
+
+    def __getitem__(self, key):  # noqa: F811
+        """
+        Slice the cycler, or get all of the values of a key.
+
+        Slicing returns a view of the rows of the cycler, in O(1).
+        ``c[key]`` is equivalent to ``c.by_key()[key]``, but only computes the
+        requested column from the values of the key.
+        """
         # TODO : maybe add numpy style fancy slicing
         if isinstance(key, slice):
-            trans = self.by_key()
-            return reduce(add, (_cycler(k, v[key]) for k, v in trans.items()))
+            return self._sliced(key)
+        try:
+            is_key = key in self._keys
+        except TypeError:  # unhashable
+            is_key = False
+        if is_key:
+            return self._column(key)
+        raise ValueError(
+            "Can only use slices or keys with Cycler.__getitem__"
+        )
+
+    def _column(self, key: K) -> list[V]:
+        """The values of *key* in every row, without building the rows."""
+        if self._is_view():
+            column = self._left._column(key)
+            return [column[i] for i in self._op]
+        if self._right is None:
+            if isinstance(self._left, Cycler):
+                return self._left._column(key)
+            if hasattr(self._left, "column"):
+                return list(self._left.column(key))
+            return [row[key] for row in self._left]
+        if key in self._right._keys:
+            column = self._right._column(key)
+            if self._op is product:
+                return column * len(self._left)
+        else:
+            column = self._left._column(key)
+            if self._op is product:
+                n = len(self._right)
+                return list(chain.from_iterable(map(repeat, column, repeat(n))))
+        n = len(self)
+        return column if len(column) == n else column[:n]
+
+    def _row(self, i: int) -> dict[K, V]:
+        """Row *i* of the cycler, for ``0 <= i < len(self)``."""
+        if self._is_view():
+            return self._left._row(self._op[i])
+        if self._right is None:
+            if isinstance(self._left, Cycler):
+                return self._left._row(i)
+            return dict(self._left[i])
+        if self._op is product:
+            i, j = divmod(i, len(self._right))
         else:
-            raise ValueError("Can only use slices with Cycler.__getitem__")
+            j = i
+        out = self._left._row(i)
+        out.update(self._right._row(j))
+        return out
+
+    def index(self, row: dict[K, V]) -> int:
+        """
+        Position of the first occurrence of *row*.
+
+        The first call builds a map from values to positions for each set of
+        values of the cycler; the first position in a composition is then
+        computed from positions in its operands, without iterating over the
+        rows or listing every occurrence.
+
+        Examples
+        --------
+        >>> cc = cycler(c='rgb') * cycler(lw=range(1000))
+        >>> cc.index({'c': 'g', 'lw': 10})
+        1010
+
+        Raises
+        ------
+        ValueError
+            If *row* is not in the cycler.
+        """
+        from ._search import first_position
+
+        position = first_position(self, row)
+        if position is None:
+            raise ValueError(f"{row!r} is not in cycler")
+        return position
 
-    def __iter__(self) -> Generator[dict[K, V], None, None]:
+    def count(self, row: dict[K, V]) -> int:
+        """
+        Number of occurrences of *row*, see `Cycler.index`.
+        """
+        return len(self._positions(row))
+
+    def _positions(self, row: dict[K, V]) -> list[int]:
+        """Sorted positions at which *row* occurs."""
+        if row.keys() != self._keys:
+            return []
+        if self._is_view():
+            from ._views import _preimage
+
+            return _preimage(self._op, self._left._positions(row))
         if self._right is None:
-            for left in self._left:
-                yield dict(left)
+            if isinstance(self._left, Cycler):
+                return self._left._positions(row)
+            return self._leaf_positions(row)
+        left = self._left._positions({k: row[k] for k in self._left._keys})
+        right = self._right._positions({k: row[k] for k in self._right._keys})
+        if self._op is product:
+            n = len(self._right)
+            return [i * n + j for i in left for j in right]
+        n = len(self)
+        return sorted(i for i in set(left).intersection(right) if i < n)
+
+    def _leaf_positions(self, row: dict[K, V]) -> list[int]:
+        cache = self.__dict__.get("_value_index")
+        # The leaf list is replaced, never modified, when the keys change.
+        if cache is None or cache[0] is not self._left:
+            keys = tuple(self._keys)
+            index: dict[tuple, list[int]] | None
+            try:
+                index = {}
+                for i, entry in enumerate(self._left):
+                    index.setdefault(tuple(entry[k] for k in keys), []).append(i)
+            except TypeError:  # unhashable values
+                index = None
+            cache = self._value_index = (self._left, keys, index)
+        _, keys, index = cache
+        values = tuple(row[k] for k in keys)
+        if index is not None:
+            try:
+                return index.get(values, [])
+            except TypeError:
+                pass
+        return [
+            i for i, entry in enumerate(self._left)
+            if tuple(entry[k] for k in keys) == values
+        ]
+
+    def sample(self, k: int, seed: Any = None) -> list[dict[K, V]]:
+        """
+        Choose *k* distinct rows at random, like `random.sample`.
+
+        Only the chosen rows are computed, by decoding their positions
+        through the composition tree, so the cost depends on *k* and not on
+        the length of the cycler.
+
+        Parameters
+        ----------
+        k : int
+            Number of rows to choose.
+        seed : int, optional
+            Seed of the random number generator, for reproducible samples.
+
+        Returns
+        -------
+        list of dict
+
+        Raises
+        ------
+        ValueError
+            If *k* is larger than the length of the cycler or negative.
+        """
+        from random import Random
+
+        positions = Random(seed).sample(range(len(self)), k)
+        return [self._row(i) for i in positions]
+
+    def choice(self, seed: Any = None) -> dict[K, V]:
+        """
+        Choose a row at random, see `Cycler.sample`.
+
+        Raises
+        ------
+        IndexError
+            If the cycler is empty.
+        """
+        from random import Random
+
+        n = len(self)
+        if not n:
+            raise IndexError("Cannot choose from an empty cycler")
+        return self._row(Random(seed).randrange(n))
+
+    def shuffled(self, seed: Any = None) -> Cycler[K, V]:
+        """
+        The rows in a pseudo-random order.
+
+        The order is a permutation of the positions of the rows that is
+        computed on the fly, so creating and iterating over the shuffled
+        cycler takes constant memory whatever its length.
+
+        Parameters
+        ----------
+        seed : int, optional
+            Seed of the permutation, for reproducible orders.
+
+        Returns
+        -------
+        `Cycler`
+        """
+        from ._views import _Permutation
+
+        if seed is None:
+            from random import getrandbits
+
+            seed = getrandbits(64)
+        return self._shallow_copy()._view(_Permutation(len(self), seed))
+
+    def where(self, predicates: Any) -> Cycler[K, V]:
+        """
+        Keep only the rows satisfying *predicates*.
+
+        Predicates of a single key are applied to the values of that key
+        before composing, so a product of filtered keys never produces the
+        rows that are filtered out.  Predicates of several keys are applied
+        at the composition joining those keys, which prunes whole sub-products
+        before the remaining keys are combined with them.  Anything that
+        cannot be applied that way is applied to the rows when the result is
+        first used, and the positions of the matching rows are then cached.
+
+        Parameters
+        ----------
+        predicates : callable or dict
+            Either a function of a row (`dict`) returning whether to keep it,
+            or a `dict` mapping a key to a function of the key's value, or a
+            tuple of keys to a function of those keys' values.
+
+        Examples
+        --------
+        >>> cc = cycler(c='rgb') * cycler(lw=range(4)) * cycler(ms=range(4))
+        >>> len(cc.where({'c': lambda c: c != 'g', ('lw', 'ms'): int.__lt__}))
+        12
+
+        Returns
+        -------
+        `Cycler`
+
+        Raises
+        ------
+        KeyError
+            If a predicate refers to a key that is not in the cycler.
+        """
+        if callable(predicates):
+            return self._filtered(predicates)
+        preds = []
+        for keys, func in predicates.items():
+            keys = keys if isinstance(keys, tuple) else (keys,)
+            if missing := set(keys) - self._keys:
+                raise KeyError(f"Can't filter on {missing}, not key(s) of this cycler")
+            preds.append((keys, func))
+        return self._where(preds)
+
+    def _where(self, preds: list[tuple[tuple, Callable]]) -> Cycler[K, V]:
+        """
+        Copy of the tree keeping only the rows satisfying all of *preds*.
+
+        *preds* is a list of ``(keys, func)`` pairs, each of which is satisfied
+        if ``func(*(row[k] for k in keys))`` is true.
+        """
+        if not preds:
+            return self._shallow_copy()
+        if self._right is None and not self._is_view():
+            if isinstance(self._left, Cycler):
+                return self._left._where(preds)
+            rows = [row for row in self._left if _satisfies(row, preds)]
+            return Cycler._from_parts(rows, None, None, self._keys)
+        if self._op is not product:
+            # Rows of zips and views are tied to positions, which filtering an
+            # operand on its own would change.
+            return self._filtered(lambda row: _satisfies(row, preds))
+        assert self._right is not None
+        left_preds = [p for p in preds if self._left._keys.issuperset(p[0])]
+        right_preds = [p for p in preds if self._right._keys.issuperset(p[0])]
+        cross = [p for p in preds if p not in left_preds and p not in right_preds]
+        node = Cycler._from_parts(
+            self._left._where(left_preds), self._right._where(right_preds),
+            product, self._keys
+        )
+        if not cross:
+            return node
+        return node._filtered(lambda row: _satisfies(row, cross))
+
+    def _filtered(self, test: Callable[[dict[K, V]], bool]) -> Cycler[K, V]:
+        """View of the rows for which ``test(row)`` is true."""
+        from ._views import _Filtered
+
+        source = self._shallow_copy()
+        return source._view(_Filtered(source, test))
+
+    def select(self, *keys: K) -> Cycler[K, V]:
+        """
+        Keep only the given keys.
+
+        The composition tree is pruned to the parts that produce *keys*, so
+        only those parts are iterated over.  The result has the same length
+        as this cycler.
+
+        Examples
+        --------
+        >>> cc = cycler(c='rgb') * cycler(lw=[1, 2])
+        >>> list(cc.select('c'))
+        [{'c': 'r'}, {'c': 'r'}, {'c': 'g'}, {'c': 'g'}, {'c': 'b'}, {'c': 'b'}]
+
+        Returns
+        -------
+        `Cycler`
+
+        Raises
+        ------
+        KeyError
+            If any of *keys* is not a key of this cycler.
+        ValueError
+            If no keys are given.
+        """
+        if not keys:
+            raise ValueError("Must select at least one key")
+        if missing := set(keys) - self._keys:
+            raise KeyError(f"Can't select {missing}, not key(s) of this cycler")
+        ret = self._select(set(keys))
+        assert ret is not None
+        return ret
+
+    def drop(self, *keys: K) -> Cycler[K, V]:
+        """
+        Remove the given keys, see `Cycler.select`.
+
+        Returns
+        -------
+        `Cycler`
+
+        Raises
+        ------
+        KeyError
+            If any of *keys* is not a key of this cycler.
+        ValueError
+            If all keys would be removed.
+        """
+        if missing := set(keys) - self._keys:
+            raise KeyError(f"Can't drop {missing}, not key(s) of this cycler")
+        if not self._keys - set(keys):
+            raise ValueError("Can't drop all keys of a cycler")
+        return self.select(*(self._keys - set(keys)))
+
+    def _select(self, keys: set[K]) -> Cycler[K, V] | None:
+        """
+        Copy of the part of the tree producing *keys*.
+
+        Returns None if this node produces none of *keys*.
+        """
+        keys = keys & self._keys
+        if not keys:
+            return None
+        if keys == self._keys:
+            return self._shallow_copy()
+        if self._is_view():
+            return self._left._select(keys)._view(self._op)
+        if self._right is None:
+            if isinstance(self._left, Cycler):
+                return self._left._select(keys)
+            return Cycler._from_parts(
+                [{k: row[k] for k in keys} for row in self._left], None, None, keys
+            )
+        left = self._left._select(keys)
+        right = self._right._select(keys)
+        if left is not None and right is not None:
+            return Cycler._from_parts(left, right, self._op, keys)
+        n = len(self)
+        if self._op is not product:
+            part = left if left is not None else right
+            return part if len(part) == n else part._view(range(n))
+        # Keep the multiplicity of the rows of the remaining operand.
+        from ._views import _Radix
+
+        if left is not None:
+            return left._view(_Radix(n, len(self._right), len(left)))
+        assert right is not None
+        return right._view(_Radix(n, 1, len(right)))
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Save the cycler to the directory *path*.
+
+        The composition tree is stored together with one file per key of
+        each leaf: a ``.npy`` array for keys whose values are all bools, all
+        ints or all floats, and a pickle of the values otherwise.
+
+        See Also
+        --------
+        Cycler.load
+        """
+        from ._io import save
+
+        save(self, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, mmap: bool = True) -> Cycler:
+        """
+        Load a cycler saved with `Cycler.save`.
+
+        Parameters
+        ----------
+        path : str or path-like
+            The directory the cycler was saved to.
+        mmap : bool
+            Whether to memory map the ``.npy`` files instead of reading them.
+            Mapping them is O(1) whatever their size; their values are then
+            read from disk as they are used, by iteration, indexing or
+            `Cycler.by_key`.  Other values are always read.
+
+        Returns
+        -------
+        `Cycler`
+
+        Notes
+        -----
+        Loading unpickles data, so only load cyclers from trusted sources.
+        """
+        from ._io import load
+
+        return load(path, mmap=mmap)
+
+    def write_csv(
+        self,
+        fileobj: Any,
+        keys: Iterable[K] | None = None,
+        chunksize: int = 1024,
+        **fmtparams: Any,
+    ) -> int:
+        """
+        Write the rows to a CSV file, with a header row of the keys.
+
+        Rows are produced and written *chunksize* at a time, so memory use
+        does not depend on the length of the cycler.
+
+        Parameters
+        ----------
+        fileobj : file-like
+            Text file to write to, opened with ``newline=''``.
+        keys : iterable, optional
+            The order of the columns; defaults to the keys sorted by their
+            `repr`, as in the HTML representation.
+        chunksize : int
+            Number of rows to write at once.
+        **fmtparams
+            Passed to `csv.writer`.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        from ._io import write_csv
+
+        return write_csv(self, fileobj, keys, chunksize, **fmtparams)
+
+    def write_jsonl(
+        self,
+        fileobj: Any,
+        keys: Iterable[K] | None = None,
+        chunksize: int = 1024,
+        **dumps_kwargs: Any,
+    ) -> int:
+        """
+        Write the rows to a JSON lines file, one object per row.
+
+        See `Cycler.write_csv` for *keys* and *chunksize*; *dumps_kwargs* are
+        passed to `json.dumps`.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        from ._io import write_jsonl
+
+        return write_jsonl(self, fileobj, keys, chunksize, **dumps_kwargs)
+
+    def to_pandas(self, keys: Iterable[K] | None = None) -> Any:
+        """
+        Convert to a `pandas.DataFrame` with a column per key.
+
+        The columns are built from the values of each key, see ``c[key]``,
+        without producing the rows.
+
+        Parameters
+        ----------
+        keys : iterable, optional
+            The order of the columns; defaults to the keys sorted by their
+            `repr`.
+
+        Returns
+        -------
+        pandas.DataFrame
+        """
+        import pandas as pd  # type: ignore[import]
+
+        from ._io import _ordered_keys
+
+        ordered = _ordered_keys(self, keys)
+        return pd.DataFrame({k: self._column(k) for k in ordered}, columns=ordered)
+
+    def to_arrow(self, keys: Iterable[K] | None = None) -> Any:
+        """
+        Convert to a `pyarrow.Table` with a column per key.
+
+        Column names are the `str` of the keys, which must be distinct; see
+        `Cycler.to_pandas` for *keys*.
+
+        Returns
+        -------
+        pyarrow.Table
+        """
+        import pyarrow as pa  # type: ignore[import]
+
+        from ._io import _ordered_keys
+
+        ordered = _ordered_keys(self, keys)
+        names = [str(k) for k in ordered]
+        if len(set(names)) != len(names):
+            raise ValueError(
+                f"Keys with the same str() cannot be Arrow column names: {ordered!r}")
+        return pa.table(dict(zip(names, map(self._column, ordered))))
+
+    @classmethod
+    def from_frame(cls, frame: Any) -> Cycler:
+        """
+        Create a cycler with a key per column of a data frame.
+
+        Each column's values are stored as a whole rather than row by row.
+
+        Parameters
+        ----------
+        frame : pandas.DataFrame or pyarrow.Table
+
+        Returns
+        -------
+        `Cycler`
+            The inner product (zip) of the columns.
+        """
+        from ._columns import _ColumnRows
+
+        arrow = hasattr(frame, "to_pydict")
+        keys = list(frame.column_names if arrow else frame.columns)
+        if len(set(keys)) != len(keys):
+            raise ValueError("Cannot create a Cycler from duplicate columns")
+        if arrow:
+            columns = [frame.column(k).to_pylist() for k in keys]
+        else:
+            columns = [frame[k].tolist() for k in keys]
+        if not keys:
+            return cls(None)
+        return cls._from_parts(_ColumnRows(keys, columns), None, None, set(keys))
+
+    def memory_usage(self, deep: bool = False) -> int:
+        """
+        Approximate number of bytes used by the cycler.
+
+        Parameters
+        ----------
+        deep : bool
+            Whether to include the values themselves, rather than only the
+            nodes and the containers holding the values.  Storage shared by
+            several parts of the cycler is counted once; memory mapped values
+            are not counted.
+
+        Returns
+        -------
+        int
+
+        See Also
+        --------
+        Cycler.describe
+        """
+        from ._memory import memory_usage
+
+        return memory_usage(self, deep)
+
+    def describe(self, deep: bool = False) -> str:
+        """
+        Describe the composition tree and the memory used by each node.
+
+        Each line shows a node: its kind, keys, length, the size of the node
+        and, for leaves and views, the size and kind of the storage holding
+        its values or row positions, and whether that storage is shared with
+        other nodes, of this cycler or of another one such as a copy, which
+        `extend` would then have to copy.  The last line sums up the total
+        size, number of nodes, depth of the tree and size of shared storage.
+
+        See `Cycler.memory_usage` for *deep*.
+
+        Returns
+        -------
+        str
+        """
+        from ._memory import describe
+
+        return describe(self, deep)
+
+    def __iter__(self) -> Iterator[dict[K, V]]:
+        rows = self._iter_dicts()
+        return self._iter_rows() if rows is None else rows
+
+    def _iter_dicts(self) -> Iterator[dict[K, V]] | None:
+        """
+        Iterator over new row dicts composed with `itertools` and `map`, so
+        that iterating over it runs no Python code per row, or None if the
+        tree holds views that cannot be iterated over this way.
+
+        Trees of leaves and zips are built from the values of each key, see
+        `_iter_columns`; products (which have more rows than values) are
+        built by merging the rows of their operands with `_merge_rows`.
+        """
+        columns = self._iter_columns()
+        if columns is not None:
+            keys = tuple(key for key, _ in columns)
+            if len(keys) == 1:
+                return map(dict.fromkeys, repeat(keys), columns[0][1])
+            values = zip(*(it for _, it in columns))
+            return map(dict, map(zip, repeat(keys), values))  # type: ignore[arg-type]
+        if self._is_view():
+            op = self._op
+            if _sliceable(op):
+                rows = self._left._iter_dicts()
+                if rows is None:
+                    return None
+                return islice(rows, op.start, op.stop, op.step)
+            from ._views import _Radix
+
+            if type(op) is _Radix:
+                rows = self._left._iter_dicts()
+                if rows is None:
+                    return None
+                # The source rows are repeated, copy them.
+                return map(dict.copy, op.take(rows))
+            return None
+        if self._right is None:
+            return self._left._iter_dicts()
+        left = self._left._iter_dicts()
+        right = self._right._iter_dicts()
+        if left is None or right is None:
+            return None
+        if self._op is product:
+            return starmap(_merge_rows, product(left, right))
+        return map(_merge_rows, left, right)
+
+    def _iter_columns(self) -> list[tuple[K, Iterator[V]]] | None:
+        """
+        Iterators over the values of each key in row order, for trees of
+        leaves, zips and the views `_iter_dicts` supports.
+
+        Returns a list of ``(key, iterator)`` pairs, in the order of the keys
+        in the rows, or None for other trees.
+        """
+        if self._is_view():
+            op = self._op
+            if _sliceable(op):
+                columns = self._left._iter_columns()
+                if columns is None:
+                    return None
+                return [(k, islice(it, op.start, op.stop, op.step))
+                        for k, it in columns]
+            from ._views import _Radix
+
+            if type(op) is _Radix:
+                columns = self._left._iter_columns()
+                if columns is None:
+                    return None
+                return [(k, op.take(it)) for k, it in columns]
+            return None
+        if self._right is None:
+            if isinstance(self._left, Cycler):
+                return self._left._iter_columns()
+            if hasattr(self._left, "column"):
+                return [(k, iter(self._left.column(k))) for k in self._left.keys]
+            if not self._left:
+                return []
+            return [(k, map(itemgetter(k), self._left)) for k in self._left[0]]
+        if self._op is product:
+            return None
+        left = self._left._iter_columns()
+        right = self._right._iter_columns()
+        if left is None or right is None:
+            return None
+        n = len(self)
+        if len(self._left) > n:
+            left = [(k, islice(it, n)) for k, it in left]
+        if len(self._right) > n:
+            right = [(k, islice(it, n)) for k, it in right]
+        return left + right
+
+    def _iter_rows(self) -> Generator[dict[K, V], None, None]:
+        """Row by row iteration, for the trees `_iter_columns` cannot handle."""
+        if self._is_view():
+            # Random access to the rows, through the plan of `row_views`.
+            from ._rows import _Plan
+
+            yield from map(_Plan(self._left).row, self._op)
+        elif self._right is None:
+            if hasattr(self._left, "column"):
+                # Column storage, see cycler._columns; it makes new dicts.
+                yield from self._left
+            else:
+                for left in self._left:
+                    yield dict(left)
         else:
             if self._op is None:
                 raise TypeError(
@@ -275,6 +1289,232 @@ class Cycler(Generic[K, V]):
                 out.update(b)
                 yield out
 
+    def __aiter__(self) -> AsyncIterator[dict[K, V]]:
+        """
+        Iterate over the rows asynchronously.
+
+        The rows are computed 1024 at a time, giving control back to the
+        event loop in between, so that iterating over a large cycler does not
+        block other tasks for long.  See also `Cycler.aiter_batches`.
+        """
+        from ._async import aiter_rows
+
+        return aiter_rows(self, 1024)
+
+    def aiter_batches(self, size: int = 1024) -> AsyncIterator[list[dict[K, V]]]:
+        """
+        Iterate asynchronously over lists of (at most) *size* rows.
+
+        Control is given back to the event loop after each list.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> async def lengths(cc):
+        ...     return [len(batch) async for batch in cc.aiter_batches(4)]
+        >>> asyncio.run(lengths(cycler(c='rgb') * cycler(lw=[1, 2, 3])))
+        [4, 4, 1]
+        """
+        if size < 1:
+            raise ValueError(f"size must be at least 1, not {size}")
+        from ._async import aiter_batches
+
+        return aiter_batches(self, size)
+
+    def amap(
+        self,
+        coro_func: Callable[[dict[K, V]], Awaitable[Any]],
+        concurrency: int = 16,
+        ordered: bool = True,
+    ) -> AsyncIterator[Any]:
+        """
+        Await ``coro_func(row)`` for every row, running several concurrently.
+
+        Tasks are created as the rows are produced, with at most
+        *concurrency* of them running at any time, and their results are
+        yielded as they are collected; neither the rows nor the results are
+        ever all held at once.  Leaving the iteration early cancels the
+        running tasks.
+
+        Parameters
+        ----------
+        coro_func : coroutine function
+            Called with each row.
+        concurrency : int
+            Maximum number of running tasks.
+        ordered : bool
+            Whether to yield the results in the order of the rows, or in the
+            order in which the tasks complete.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> async def double(row):
+        ...     await asyncio.sleep(0)
+        ...     return 2 * row['x']
+        >>> async def main():
+        ...     return [r async for r in cycler(x=range(5)).amap(double, 2)]
+        >>> asyncio.run(main())
+        [0, 2, 4, 6, 8]
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, not {concurrency}")
+        from ._async import amap
+
+        return amap(self, coro_func, concurrency, ordered)
+
+    def row_views(self) -> Iterator[Mapping[K, V]]:
+        """
+        Iterate over read-only views of the rows, instead of new dicts.
+
+        Each view is a `~collections.abc.Mapping` holding its row number;
+        the value of a key is looked up from the columns of the cycler when
+        it is accessed, in constant time whatever the depth of the tree.
+        Producing a row therefore costs the same whatever the number of keys,
+        and values that are never accessed are never looked up, which suits
+        consumers that only read a few keys or unpack the rows as keyword
+        arguments.
+
+        Examples
+        --------
+        >>> cc = cycler(color='rgb') * cycler(lw=[1, 2])
+        >>> row = list(cc.row_views())[3]
+        >>> row['color'], row['lw']
+        ('g', 2)
+        >>> dict(**row)
+        {'color': 'g', 'lw': 2}
+
+        Returns
+        -------
+        iterator of Mapping
+        """
+        from ._rows import row_views
+
+        return row_views(self)
+
+    def iter_deltas(self, gray: bool = False) -> Iterator[dict[K, V]]:
+        """
+        Iterate over the changes from each row to the next.
+
+        The first item is the first row; each of the others only holds the
+        keys whose value comes from a different row of their leaf than in the
+        previous row.  This is worked out from the structure of the cycler
+        rather than by comparing values: the keys of the right operand of a
+        product change every row, and those of the left operand once every
+        ``len(right)`` rows, so the outer keys of a product are rarely looked
+        at.  Equal values from different rows of a leaf count as changes.
+
+        Parameters
+        ----------
+        gray : bool
+            Visit the rows in reflected Gray code order instead, in which
+            the operands of a product of leaves take turns so that exactly
+            one leaf changes from each row to the next.  The same rows are
+            produced, in a different order.
+
+        Examples
+        --------
+        >>> cc = cycler(c='rg') * cycler(lw=[1, 2, 3])
+        >>> list(cc.iter_deltas())  # doctest: +NORMALIZE_WHITESPACE
+        [{'c': 'r', 'lw': 1}, {'lw': 2}, {'lw': 3},
+         {'lw': 1, 'c': 'g'}, {'lw': 2}, {'lw': 3}]
+        >>> list(cc.iter_deltas(gray=True))
+        [{'c': 'r', 'lw': 1}, {'lw': 2}, {'lw': 3}, {'c': 'g'}, {'lw': 2}, {'lw': 1}]
+
+        Returns
+        -------
+        iterator of dict
+
+        Raises
+        ------
+        ValueError
+            With *gray*, if the cycler is not a product of leaves (or of sums
+            of equal length leaves).
+        """
+        from ._rows import iter_deltas
+
+        return iter_deltas(self, gray)
+
+    def map_parallel(
+        self,
+        func: Callable[[dict[K, V]], Any],
+        executor: Any = None,
+        chunksize: int | None = None,
+        ordered: bool = True,
+        max_in_flight: int | None = None,
+    ) -> Iterator[Any]:
+        """
+        Apply *func* to every row, in parallel, like ``executor.map(func, self)``.
+
+        The work is sent to the executor as ranges of row numbers; each
+        worker computes the rows of its ranges itself from the cycler, which
+        is pickled once (and unpickled once per worker process) instead of
+        pickling every row.  Results are streamed back while at most
+        *max_in_flight* ranges are submitted but not collected, so that a
+        slow consumer holds up the submission of new work.
+
+        Parameters
+        ----------
+        func : callable
+            Called with each row, a dict; for process pools it must be
+            picklable, as must the values of the cycler.
+        executor : `concurrent.futures.Executor`, optional
+            Defaults to a new `~concurrent.futures.ProcessPoolExecutor`, shut
+            down when the iteration ends, whose workers receive the pickled
+            cycler when they start.  Other executors receive it with every
+            task, which for large cyclers calls for a large *chunksize*.
+            With a `~concurrent.futures.ThreadPoolExecutor` the cycler is
+            shared rather than pickled.
+        chunksize : int, optional
+            Number of rows per task.  The default splits the rows into about
+            four tasks per CPU, of at most 1024 rows.
+        ordered : bool
+            Whether to yield the results in the order of the rows, or in the
+            order in which the tasks complete.
+        max_in_flight : int, optional
+            Maximum number of tasks submitted but not yet collected, twice
+            the number of CPUs by default.
+
+        Returns
+        -------
+        iterator
+            The results of *func*.  Nothing is submitted before the first
+            result is requested.
+
+        Examples
+        --------
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> cc = cycler(a=range(3)) * cycler(b=range(2))
+        >>> with ThreadPoolExecutor(2) as executor:
+        ...     list(cc.map_parallel(lambda row: row['a'] * row['b'], executor))
+        [0, 0, 0, 1, 0, 2]
+        """
+        from ._parallel import map_parallel
+
+        return map_parallel(self, func, executor, chunksize, ordered, max_in_flight)
+
+    def shared_cycle(self) -> Iterator[dict[K, V]]:
+        """
+        Return an infinite iterator over the rows, to share between threads.
+
+        Like ``self()``, but ``next`` can be called from several threads at
+        once, each call getting the next row of the cycle: the position is
+        advanced under a lock and the row is then computed outside of it.
+        The rows are computed from their position rather than buffered, and
+        the cycle is over the rows the cycler has when this is called.
+
+        Examples
+        --------
+        >>> styles = cycler(color='rgb').shared_cycle()
+        >>> [next(styles)['color'] for _ in range(4)]
+        ['r', 'g', 'b', 'r']
+        >>> styles.position
+        1
+        """
+        from ._shared import SharedCycle
+
+        return SharedCycle(self._shallow_copy())
+
     def __add__(self, other: Cycler[L, U]) -> Cycler[K | L, V | U]:
         """
         Pair-wise combine two equal length cyclers (zip).
@@ -287,21 +1527,17 @@ class Cycler(Generic[K, V]):
             raise ValueError(
                 f"Can only add equal length cycles, not {len(self)} and {len(other)}"
             )
-        return Cycler(
-            cast(Cycler[Union[K, L], Union[V, U]], self),
-            cast(Cycler[Union[K, L], Union[V, U]], other),
-            zip
-        )
+        return _interned(Cycler(self, other, zip))  # type: ignore[arg-type]
 
     @overload
     def __mul__(self, other: Cycler[L, U]) -> Cycler[K | L, V | U]:
         ...
 
     @overload
-    def __mul__(self, other: int) -> Cycler[K, V]:
+    def __mul__(self, other: int) -> Cycler[K, V]:  # noqa: F811
         ...
 
-    def __mul__(self, other):
+    def __mul__(self, other):  # noqa: F811
         """
         Outer product of two cyclers (`itertools.product`) or integer
         multiplication.
@@ -311,16 +1547,13 @@ class Cycler(Generic[K, V]):
         other : Cycler or int
         """
         if isinstance(other, Cycler):
-            return Cycler(
-                cast(Cycler[Union[K, L], Union[V, U]], self),
-                cast(Cycler[Union[K, L], Union[V, U]], other),
-                product
-            )
+            return _interned(Cycler(self, other, product))
         elif isinstance(other, int):
-            trans = self.by_key()
-            return reduce(
-                add, (_cycler(k, v * other) for k, v in trans.items())
-            )
+            from ._views import _Radix
+
+            n = len(self)
+            return _interned(
+                self._shallow_copy()._view(_Radix(max(n * other, 0), 1, n)))
         else:
             return NotImplemented
 
@@ -329,16 +1562,16 @@ class Cycler(Generic[K, V]):
         ...
 
     @overload
-    def __rmul__(self, other: int) -> Cycler[K, V]:
+    def __rmul__(self, other: int) -> Cycler[K, V]:  # noqa: F811
         ...
 
-    def __rmul__(self, other):
+    def __rmul__(self, other):  # noqa: F811
         return self * other
 
     def __len__(self) -> int:
         op_dict: dict[Callable, Callable[[int, int], int]] = {zip: min, product: mul}
         if self._right is None:
-            return len(self._left)
+            return len(self._op if self._is_view() else self._left)
         l_len = len(self._left)
         r_len = len(self._right)
         return op_dict[self._op](l_len, r_len)
@@ -360,11 +1593,11 @@ class Cycler(Generic[K, V]):
                 f"Can only add equal length cycles, not {len(self)} and {len(other)}"
             )
         # True shallow copy of self is fine since this is in-place
-        old_self = copy.copy(self)
+        old_self = self._shallow_copy()
         self._keys = _process_keys(old_self, other)
         self._left = old_self
         self._op = zip
-        self._right = Cycler(other._left, other._right, other._op)
+        self._right = other._shallow_copy()
         return self
 
     def __imul__(self, other: Cycler[K, V] | int) -> Cycler[K, V]:  # type: ignore[misc]
@@ -378,27 +1611,37 @@ class Cycler(Generic[K, V]):
         if not isinstance(other, Cycler):
             raise TypeError("Cannot *= with a non-Cycler object")
         # True shallow copy of self is fine since this is in-place
-        old_self = copy.copy(self)
+        old_self = self._shallow_copy()
         self._keys = _process_keys(old_self, other)
         self._left = old_self
         self._op = product
-        self._right = Cycler(other._left, other._right, other._op)
+        self._right = other._shallow_copy()
         return self
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Cycler):
             return False
+        # Copies share their parts, as do interned cyclers (see `intern`).
+        if (self._left is other._left and self._right is other._right
+                and self._op is other._op):
+            return self._keys == other._keys
         if len(self) != len(other):
             return False
         if self.keys ^ other.keys:
             return False
+        return self._rows_equal(other)
+
+    def _rows_equal(self, other: Cycler) -> bool:
+        """Compare the rows of two cyclers one by one (the O(n) part of ``==``)."""
         return all(a == b for a, b in zip(self, other))
 
     __hash__ = None  # type: ignore
 
     def __repr__(self) -> str:
         op_map = {zip: "+", product: "*"}
-        if self._right is None:
+        if self._is_view() or len(self._keys) > 1 and self._right is None:
+            return repr(self.simplify())
+        elif self._right is None:
             lab = self.keys.pop()
             itr = list(v[lab] for v in self)
             return f"cycler({lab!r}, {itr!r})"
@@ -453,6 +1696,68 @@ class Cycler(Generic[K, V]):
     # for back compatibility
     _transpose = by_key
 
+    def unique(self) -> Cycler[K, V]:
+        """
+        Remove repeated rows, keeping the first occurrence of each.
+
+        Rows are compared by the tuple of their values.  When the structure
+        of the cycler guarantees that no row repeats (e.g. a product of keys
+        whose values are each distinct) the rows are not looked at at all.
+
+        Examples
+        --------
+        >>> cc = cycler(c='rgr') + cycler(lw=[1, 2, 1])
+        >>> list(cc.unique())
+        [{'c': 'r', 'lw': 1}, {'c': 'g', 'lw': 2}]
+
+        Returns
+        -------
+        `Cycler`
+        """
+        if self._rows_unique():
+            return self._shallow_copy()
+        keys = list(self._keys)
+        seen: set[tuple] = set()
+        # Rows with unhashable values fall back to comparisons.
+        seen_unhashable: list[tuple] = []
+        keep = []
+        for i, row in enumerate(self):
+            values = tuple(row[k] for k in keys)
+            try:
+                if values in seen:
+                    continue
+                seen.add(values)
+            except TypeError:
+                if values in seen_unhashable:
+                    continue
+                seen_unhashable.append(values)
+            keep.append(i)
+        return self._shallow_copy()._view(keep)
+
+    def _rows_unique(self) -> bool:
+        """
+        Whether the structure guarantees that no row repeats.
+
+        False means that rows may (not must) repeat.
+        """
+        if self._is_view():
+            # Views that do not repeat source rows keep them unique.
+            injective = (isinstance(self._op, range)
+                         or getattr(self._op, "_injective", False))
+            return injective and self._left._rows_unique()
+        if self._right is None:
+            if isinstance(self._left, Cycler):
+                return self._left._rows_unique()
+            keys = list(self._keys)
+            try:
+                distinct = {tuple(row[k] for k in keys) for row in self._left}
+            except TypeError:
+                return False
+            return len(distinct) == len(self._left)
+        if self._op is product:
+            return self._left._rows_unique() and self._right._rows_unique()
+        return self._left._rows_unique() or self._right._rows_unique()
+
     def simplify(self) -> Cycler[K, V]:
         """
         Simplify the cycler into a sum (but no products) of cyclers.
@@ -467,7 +1772,7 @@ class Cycler(Generic[K, V]):
         # ((a + b) + (c + d))
         # I would believe that there is some performance implications
         trans = self.by_key()
-        return reduce(add, (_cycler(k, v) for k, v in trans.items()))
+        return _sum(_cycler(k, v) for k, v in trans.items())
 
     concat = concat
 
@@ -478,16 +1783,16 @@ def cycler(arg: Cycler[K, V]) -> Cycler[K, V]:
 
 
 @overload
-def cycler(**kwargs: Iterable[V]) -> Cycler[str, V]:
+def cycler(**kwargs: Iterable[V]) -> Cycler[str, V]:  # noqa: F811
     ...
 
 
 @overload
-def cycler(label: K, itr: Iterable[V]) -> Cycler[K, V]:
+def cycler(label: K, itr: Iterable[V]) -> Cycler[K, V]:  # noqa: F811
     ...
 
 
-def cycler(*args, **kwargs):
+def cycler(*args, **kwargs):  # noqa: F811
     """
     Create a new `Cycler` object from a single positional argument,
     a pair of positional arguments, or the combination of keyword arguments.
@@ -546,11 +1851,35 @@ def cycler(*args, **kwargs):
         )
 
     if kwargs:
-        return reduce(add, (_cycler(k, v) for k, v in kwargs.items()))
+        return _sum(_cycler(k, v) for k, v in kwargs.items())
 
     raise TypeError("Must have at least a positional OR keyword arguments")
 
 
+def _interned(cyc: Cycler[K, V]) -> Cycler[K, V]:
+    if not _interning:
+        return cyc
+    from ._intern import intern
+
+    return intern(cyc)
+
+
+def _sliceable(index: Any) -> bool:
+    """
+    Whether the rows of a view with the index sequence *index* are best
+    produced by slicing an iterator over the source with `itertools.islice`,
+    which builds every source row up to the last, skipped or not; otherwise
+    they are built one by one, by random access.
+    """
+    return (type(index) is range and index.step > 0
+            and index.start + len(index) * index.step <= 4 * len(index))
+
+
+def _satisfies(row: dict, preds: list[tuple[tuple, Callable]]) -> bool:
+    """Whether *row* satisfies all of the ``(keys, func)`` pairs in *preds*."""
+    return all(func(*(row[k] for k in keys)) for keys, func in preds)
+
+
 def _cycler(label: K, itr: Iterable[V]) -> Cycler[K, V]:
     """
     Create a new `Cycler` object from a property name and iterable of values.
@@ -574,8 +1903,119 @@ def _cycler(label: K, itr: Iterable[V]) -> Cycler[K, V]:
             raise ValueError(msg)
 
         lab = keys.pop()
-        # Doesn't need to be a new list because
-        # _from_iter() will be creating that new list anyway.
-        itr = (v[lab] for v in itr)
+        # Cyclers are copied in O(1), whatever their length.
+        return itr._renamed(lab, label) if lab != label else itr._shallow_copy()
 
     return Cycler._from_iter(label, itr)
+
+
+def instrument():
+    """
+    Context manager recording the work done by `Cycler` objects.
+
+    Counts and times calls to `Cycler.by_key`, full iterations, rows
+    produced, row dictionaries allocated, ``__len__`` recursion, full
+    ``==`` scans and node constructions, attributing each to the line of
+    calling code outside of cycler.  Instrumentation costs nothing while
+    inactive.  Setting the environment variable ``CYCLER_INSTRUMENT=1``
+    enables it for the whole process and prints a report at exit.
+
+    Examples
+    --------
+    >>> with instrument() as stats:
+    ...     cc = cycler(c='rgb') * cycler(lw=range(3))
+    ...     d = cc.by_key()
+    >>> stats.counts['by_key']
+    1
+    >>> print(stats.report())  # doctest: +SKIP
+
+    Returns
+    -------
+    context manager
+        Yields a ``Stats`` object whose ``counts``, ``seconds`` and ``sites``
+        attributes are filled in while the context is active.
+    """
+    from ._instrument import instrument
+
+    return instrument()
+
+
+def parse(text: str) -> Cycler:
+    """
+    Build a `Cycler` from an expression in the syntax of this module.
+
+    The expression can use `cycler`, `concat` (as a function or a method),
+    ``+``, ``*``, multiplication by integers and slicing; the values must be
+    literals.  It is parsed with `ast`, never evaluated, so untrusted text
+    such as style files is safe to parse: the rows copied by `concat` or by
+    a cycler made from another one, and integer multipliers, are limited to
+    a million.  The results are cached by text, and a new copy (made in
+    O(1)) of the cached `Cycler` is returned, so parsing the same text again
+    is fast.
+
+    Examples
+    --------
+    >>> parse("cycler('color', 'rgb') * cycler(lw=[1, 2])")
+    (cycler('color', ['r', 'g', 'b']) * cycler('lw', [1, 2]))
+
+    Raises
+    ------
+    ValueError
+        If *text* is not a valid cycler expression.
+    """
+    from ._parse import parse
+
+    return parse(text)
+
+
+def intern(cyc: Cycler[K, V]) -> Cycler[K, V]:
+    """
+    Return a copy of *cyc* sharing its nodes with the identical interned
+    cyclers.
+
+    Identical cyclers (built from equal values, in the same way) that are
+    interned share a single node for each part of their trees; comparing
+    them is then O(1), and data derived from shared parts, such as the
+    value index of `Cycler.index`, is computed once for all of them.  The
+    shared nodes are freed with the last cycler using them.
+
+    Interning a leaf takes a pass over its values; interning a composition
+    of interned cyclers is O(1).  Views other than slices and integer
+    multiples are not interned, nor are the compositions holding them.
+
+    See Also
+    --------
+    set_interning
+    """
+    from ._intern import intern
+
+    return intern(cyc)
+
+
+def set_interning(enabled: bool) -> bool:
+    """
+    Set whether new cyclers are interned, and return the previous setting.
+
+    While enabled, the cyclers made by `cycler`, ``+``, ``*`` and `concat`
+    are interned (see `intern`), so that, for instance, every call to
+    ``cycler(color=palette)`` with the same palette shares one leaf.
+
+    Examples
+    --------
+    >>> previous = set_interning(True)
+    >>> a = cycler(color='rgb') * cycler(lw=[1, 2])
+    >>> b = cycler(color='rgb') * cycler(lw=[1, 2])
+    >>> a._left is b._left
+    True
+    >>> _ = set_interning(previous)
+    """
+    global _interning
+    previous = _interning
+    _interning = bool(enabled)
+    return previous
+
+
+if os.environ.get("CYCLER_INSTRUMENT"):
+    from ._instrument import _enable_from_environment
+
+    _enable_from_environment()
@@ -0,0 +1,49 @@
+"""
+Asynchronous iteration over the rows of a `Cycler`, see `Cycler.__aiter__`,
+`Cycler.aiter_batches` and `Cycler.amap`.
+
+The rows are produced synchronously, a batch at a time, and control is given
+back to the event loop between batches.
+"""
+
+import asyncio
+from collections import deque
+from itertools import islice
+
+
+async def aiter_batches(cyc, size):
+    rows = iter(cyc)
+    while batch := list(islice(rows, size)):
+        yield batch
+        await asyncio.sleep(0)
+
+
+async def aiter_rows(cyc, size):
+    async for batch in aiter_batches(cyc, size):
+        for row in batch:
+            yield row
+
+
+async def _collect(pending, ordered):
+    if ordered:
+        return [await pending.popleft()]
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    for task in done:
+        pending.remove(task)
+    return [task.result() for task in done]
+
+
+async def amap(cyc, coro_func, concurrency, ordered):
+    pending = deque()
+    try:
+        async for row in aiter_rows(cyc, max(concurrency, 64)):
+            if len(pending) >= concurrency:
+                for result in await _collect(pending, ordered):
+                    yield result
+            pending.append(asyncio.ensure_future(coro_func(row)))
+        while pending:
+            for result in await _collect(pending, ordered):
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,260 @@
+"""
+Column storage for the values of leaf cyclers.
+
+The ``_left`` of a leaf `Cycler` is a sequence of single-row dicts.  Besides
+plain lists, `_ColumnRows` provides that sequence on top of per-key columns,
+which can be any sequence of values: a `list`, one of the encoded columns
+chosen by `_encode` for repetitive values, or a `_MappedColumn` read from a
+``.npy`` file.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import chain, repeat
+import sys
+
+
+class _ColumnRows:
+    """
+    Read-only sequence of row dicts backed by one column per key.
+
+    Parameters
+    ----------
+    keys : tuple
+        The keys, in the order of *columns*.
+    columns : tuple of sequence
+        The values of each key; all of the same length.
+    """
+
+    __slots__ = ("keys", "columns")
+
+    def __init__(self, keys, columns):
+        self.keys = tuple(keys)
+        self.columns = tuple(columns)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, i):
+        return {k: c[i] for k, c in zip(self.keys, self.columns)}
+
+    def __iter__(self):
+        if len(self.columns) == 1:
+            return map(dict.fromkeys, repeat(self.keys), self.columns[0])
+        return map(dict, map(zip, repeat(self.keys), zip(*self.columns)))
+
+    def column(self, key):
+        return self.columns[self.keys.index(key)]
+
+    def renamed(self, old, new):
+        keys = tuple(new if k == old else k for k in self.keys)
+        return type(self)(keys, self.columns)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.keys!r}, {self.columns!r})"
+
+
+# Column dtypes stored in binary, as (``.npy`` descr, struct format, type).
+_BINARY_DTYPES = [
+    ("|b1", "?", bool),
+    ("<i8", "q", int),
+    ("<f8", "d", float),
+]
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def _binary_dtype(values):
+    """The entry of `_BINARY_DTYPES` able to hold *values*, or None."""
+    if not values:
+        return None
+    for descr, fmt, typ in _BINARY_DTYPES:
+        if all(type(v) is typ for v in values):
+            if typ is int and not all(-2**63 <= v < 2**63 for v in values):
+                return None
+            return descr, fmt
+    return None
+
+
+def _write_npy(fileobj, values, descr, fmt):
+    """Write *values* as a 1D ``.npy`` (format version 1.0) array."""
+    header = repr({"descr": descr, "fortran_order": False,
+                   "shape": (len(values),)})
+    # Pad so that the data starts on a 64 byte boundary, as numpy does.
+    size = len(_NPY_MAGIC) + 2 + len(header) + 1
+    header = (header + " " * (-size % 64) + "\n").encode("latin1")
+    fileobj.write(_NPY_MAGIC)
+    fileobj.write(len(header).to_bytes(2, "little"))
+    fileobj.write(header)
+    data = array("b" if fmt == "?" else fmt, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    data.tofile(fileobj)
+
+
+def _read_npy_header(fileobj):
+    """Return the struct format, length and data offset of a ``.npy`` file."""
+    from ast import literal_eval
+
+    if fileobj.read(len(_NPY_MAGIC)) != _NPY_MAGIC:
+        raise ValueError(f"{fileobj.name} is not a version 1.0 .npy file")
+    header_len = int.from_bytes(fileobj.read(2), "little")
+    header = literal_eval(fileobj.read(header_len).decode("latin1"))
+    fmts = {descr: fmt for descr, fmt, _ in _BINARY_DTYPES}
+    if (header["descr"] not in fmts or header["fortran_order"]
+            or len(header["shape"]) != 1):
+        raise ValueError(f"Unsupported .npy array in {fileobj.name}")
+    return fmts[header["descr"]], header["shape"][0], fileobj.tell()
+
+
+class _MappedColumn:
+    """
+    A column of numbers stored in a ``.npy`` file.
+
+    With *mmap* the file is memory mapped, so opening it is O(1) and only
+    the pages that are used are read; otherwise it is read into memory.
+    Pickling stores the path, not the values.
+    """
+
+    def __init__(self, path, mmap=True):
+        self._path = path
+        self._mmap = mmap
+        with open(path, "rb") as f:
+            fmt, length, offset = _read_npy_header(f)
+            if mmap and length and sys.byteorder == "little":
+                import mmap as _mmap
+
+                buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+                self._data = memoryview(buffer)[offset:].cast(fmt)
+            else:
+                data = array("b" if fmt == "?" else fmt)
+                data.fromfile(f, length)
+                if sys.byteorder != "little":
+                    data.byteswap()
+                self._data = (memoryview(data.tobytes()).cast(fmt)
+                              if fmt == "?" else data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, i):
+        return self._data[i]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __reduce__(self):
+        return type(self), (self._path, self._mmap)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._path!r})"
+
+
+class _DictColumn:
+    """
+    Dictionary encoded column: a table of the distinct values and, for each
+    entry, the position of its value in the table as a compact integer.
+    """
+
+    __slots__ = ("table", "codes")
+
+    def __init__(self, table, codes):
+        self.table = table
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.table[self.codes[i]]
+
+    def __iter__(self):
+        return map(self.table.__getitem__, self.codes)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.table!r}, {self.codes!r})"
+
+
+class _RunColumn:
+    """
+    Run-length encoded column: the value of each run of repeated entries and
+    the (exclusive) position at which the run ends.
+    """
+
+    __slots__ = ("values", "ends")
+
+    def __init__(self, values, ends):
+        self.values = values
+        self.ends = ends
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("index out of range")
+        return self.values[bisect_right(self.ends, i)]
+
+    def __iter__(self):
+        lengths = map(int.__sub__, self.ends, chain((0,), self.ends))
+        return chain.from_iterable(map(repeat, self.values, lengths))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.values!r}, {self.ends!r})"
+
+
+# Values of these types are merged with equal values of the same type when
+# encoding; anything else only with itself, as it may be mutable.
+_VALUE_TYPES = frozenset({str, bytes, int, bool, complex, type(None)})
+# Shortest columns worth encoding.
+_MIN_ENCODED_LENGTH = 16
+
+
+def _identity(value):
+    """Key under which *value* can stand in for other values when encoding."""
+    typ = type(value)
+    if typ is float:
+        # Tells -0.0 from 0.0.
+        return typ, value.hex()
+    if typ in _VALUE_TYPES:
+        return typ, value
+    return None, id(value)
+
+
+def _encode(values):
+    """
+    Store the list *values* in the smallest of a list, a `_DictColumn` or a
+    `_RunColumn`.
+    """
+    n = len(values)
+    if n < _MIN_ENCODED_LENGTH:
+        return values
+    keys = list(map(_identity, values))
+    index = {}
+    table = []
+    codes = []
+    for key, value in zip(keys, values):
+        if key not in index:
+            index[key] = len(table)
+            table.append(value)
+        codes.append(index[key])
+    starts = [i for i in range(n) if i == 0 or keys[i] != keys[i - 1]]
+    # Approximate sizes, counting 8 bytes per reference.
+    typecode = next(t for t in "BHIL" if len(index) <= 256 ** array(t).itemsize)
+    sizes = {
+        "list": 8 * n,
+        "dict": 8 * len(index) + array(typecode).itemsize * n,
+        "runs": 16 * len(starts),
+    }
+    best = min(sizes, key=sizes.get)
+    if sizes[best] > sizes["list"] // 2:
+        return values
+    if best == "dict":
+        return _DictColumn(table, array(typecode, codes))
+    if best == "runs":
+        ends = array("q", starts[1:])
+        ends.append(n)
+        return _RunColumn([values[i] for i in starts], ends)
+    return values
@@ -0,0 +1,287 @@
+"""
+Opt-in instrumentation of the work done by `Cycler` objects.
+
+While instrumentation is active the hot-path methods of `Cycler` are replaced
+by counting wrappers; when it is inactive the original methods are restored,
+so the disabled state costs nothing.  Every event is attributed to the first
+stack frame outside of the :mod:`cycler` package, which is the line of user
+code that (directly or indirectly) asked for the work.
+
+Recorded events:
+
+``by_key``
+    Calls to `Cycler.by_key` (timed).
+``iter``
+    Complete iterations over a whole `Cycler`, as opposed to the iteration
+    over its children done to compose the rows (timed).
+``rows``
+    Rows produced by iterating over whole cyclers, complete or not.
+``dicts``
+    Row dictionaries allocated at every level of the composition tree: the
+    rows produced, and those of operands that are merged into the rows of
+    products, copied or skipped on the way; trees of leaves and zips
+    iterated over through the columns of their leaves only allocate the rows
+    they produce.
+``len``
+    Calls to `Cycler.__len__`, including the recursive ones.
+``len_recursion``
+    Calls to `Cycler.__len__` made by cycler itself.
+``eq_scan``
+    Comparisons that fell through to a full row-by-row scan (timed).
+``node``
+    `Cycler` node constructions.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from itertools import product
+import sys
+from time import perf_counter
+
+
+class Stats:
+    """
+    Counters collected while instrumentation is active.
+
+    Attributes
+    ----------
+    counts : collections.Counter
+        Number of occurrences of each event.
+    seconds : collections.Counter
+        Cumulative wall time spent in each timed event.
+    sites : dict
+        Map of event to a `collections.Counter` of call sites, formatted as
+        ``'filename:lineno (function)'``.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.seconds = Counter()
+        self.sites = defaultdict(Counter)
+
+    def _record(self, event, site, n=1, seconds=None):
+        self.counts[event] += n
+        self.sites[event][site] += n
+        if seconds is not None:
+            self.seconds[event] += seconds
+
+    def report(self, top=5):
+        """
+        Format the counters as a human readable table.
+
+        Parameters
+        ----------
+        top : int
+            Number of call sites to show for each event.
+
+        Returns
+        -------
+        str
+        """
+        lines = [f"{'event':<14}{'count':>12}{'seconds':>12}"]
+        for event, n in self.counts.most_common():
+            secs = f"{self.seconds[event]:.6f}" if event in self.seconds else ""
+            lines.append(f"{event:<14}{n:>12}{secs:>12}")
+            for site, m in self.sites[event].most_common(top):
+                lines.append(f"    {m:>10}  {site}")
+        return "\n".join(lines)
+
+
+_active: list[Stats] = []
+_originals: dict = {}
+
+
+def _call_site():
+    """Return the first frame outside of cycler, formatted for `Stats.sites`."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        name = frame.f_globals.get("__name__", "")
+        if name != "cycler" and not name.startswith("cycler."):
+            code = frame.f_code
+            return f"{code.co_filename}:{frame.f_lineno} ({code.co_name})"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+def _is_recursive_call(*methods):
+    """Whether the instrumented method was called by one of cycler's *methods*."""
+    frame = sys._getframe(2)
+    return (frame.f_globals.get("__name__") == "cycler"
+            and frame.f_code.co_name in methods)
+
+
+def _record(event, site, n=1, seconds=None):
+    for stats in _active:
+        stats._record(event, site, n, seconds)
+
+
+def _wrap_init(orig):
+    def __init__(self, *args, **kwargs):
+        _record("node", _call_site())
+        orig(self, *args, **kwargs)
+    return __init__
+
+
+def _wrap_len(orig):
+    def __len__(self):
+        site = _call_site()
+        _record("len", site)
+        if _is_recursive_call("__len__"):
+            _record("len_recursion", site)
+        return orig(self)
+    return __len__
+
+
+def _wrap_by_key(orig):
+    def by_key(self):
+        site = _call_site()
+        start = perf_counter()
+        try:
+            return orig(self)
+        finally:
+            _record("by_key", site, seconds=perf_counter() - start)
+    return by_key
+
+
+def _wrap_rows_equal(orig):
+    def _rows_equal(self, other):
+        site = _call_site()
+        start = perf_counter()
+        try:
+            return orig(self, other)
+        finally:
+            _record("eq_scan", site, seconds=perf_counter() - start)
+    return _rows_equal
+
+
+def _counted_rows(rows, site, top_level):
+    n = 0
+    elapsed = 0.0
+    exhausted = False
+    try:
+        while True:
+            start = perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                exhausted = True
+                break
+            finally:
+                elapsed += perf_counter() - start
+            n += 1
+            yield row
+    finally:
+        _record("dicts", site, n)
+        if top_level:
+            _record("rows", site, n)
+            if exhausted:
+                _record("iter", site, seconds=elapsed)
+
+
+def _dropped_rows(node):
+    """
+    Number of rows of the operands of *node* that `Cycler._iter_dicts` builds
+    and then drops while composing its own rows.
+    """
+    if node._iter_columns() is not None:
+        return 0
+    if node._is_view():
+        op = node._op
+        if type(op) is range:
+            # Skipped by islice.
+            return op[-1] + 1 - len(op) if len(op) else 0
+        # Copied by a _Radix.
+        return min(op._mod, len(node._left))
+    if node._right is None:
+        return 0
+    if node._op is product:
+        return len(node._left) + len(node._right)
+    return 2 * len(node)
+
+
+def _counted_dicts(rows, n, site):
+    # Recorded once the rows are used, as _iter_dicts iterators may be
+    # dropped when a sibling operand cannot be iterated over this way.
+    first = next(rows, None)
+    if first is None:
+        return
+    _record("dicts", site, n)
+    yield first
+    yield from rows
+
+
+def _wrap_iter_dicts(orig):
+    def _iter_dicts(self):
+        rows = orig(self)
+        if rows is None:
+            return None
+        n = _dropped_rows(self)
+        return _counted_dicts(rows, n, _call_site()) if n else rows
+    return _iter_dicts
+
+
+def _wrap_iter(orig):
+    def __iter__(self):
+        top_level = not _is_recursive_call("__iter__", "_iter_rows")
+        return _counted_rows(orig(self), _call_site(), top_level)
+    return __iter__
+
+
+_wrappers = {
+    "__init__": _wrap_init,
+    "__len__": _wrap_len,
+    "__iter__": _wrap_iter,
+    "_iter_dicts": _wrap_iter_dicts,
+    "by_key": _wrap_by_key,
+    "_rows_equal": _wrap_rows_equal,
+}
+
+
+def enable(stats=None):
+    """
+    Start recording events into *stats* (a new `Stats` if not given).
+
+    Returns
+    -------
+    Stats
+    """
+    from . import Cycler
+
+    if stats is None:
+        stats = Stats()
+    if not _active:
+        for name, wrap in _wrappers.items():
+            _originals[name] = Cycler.__dict__[name]
+            setattr(Cycler, name, wrap(_originals[name]))
+    _active.append(stats)
+    return stats
+
+
+def disable(stats):
+    """Stop recording events into *stats*."""
+    from . import Cycler
+
+    _active.remove(stats)
+    if not _active:
+        for name, orig in _originals.items():
+            setattr(Cycler, name, orig)
+        _originals.clear()
+
+
+@contextmanager
+def instrument():
+    stats = enable()
+    try:
+        yield stats
+    finally:
+        disable(stats)
+
+
+def _enable_from_environment():
+    """Record for the whole process and report to stderr at exit."""
+    import atexit
+
+    stats = enable()
+    atexit.register(lambda: print(stats.report(), file=sys.stderr))
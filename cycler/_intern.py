@@ -0,0 +1,112 @@
+"""
+Interning (hash-consing) of `Cycler` nodes, see `cycler.intern`.
+
+Each distinct tree is represented by one *canonical* node, which is never
+handed out: interned cyclers are copies of it (see `Cycler._shallow_copy`)
+and so share its parts.  Canonical leaves are found by their keys and a
+fingerprint of their values, and canonical composed nodes by the identity of
+their (canonical) children and their operation, so interning a cycler built
+from interned operands is O(1).
+
+The canonical nodes are held in `weakref.WeakValueDictionary` objects, and
+kept alive by a reference from each interned copy, so they disappear with
+the last cycler made from them.  The identities used in the keys stay
+valid as long as the entries do, since the canonical nodes keep their
+children and storage alive.
+"""
+
+from __future__ import annotations
+
+from weakref import WeakValueDictionary
+
+from . import Cycler
+from ._columns import _identity
+from ._views import _Radix
+
+# Canonical nodes by structural key.
+_nodes: WeakValueDictionary[tuple, Cycler] = WeakValueDictionary()
+# Canonical nodes by id(), to recognize them.
+_canonical_ids: WeakValueDictionary[int, Cycler] = WeakValueDictionary()
+
+
+def _leaf_content(node):
+    """The keys of a leaf, in storage order, and the identities of its values."""
+    rows = node._left
+    if hasattr(rows, "column"):
+        keys, columns = rows.keys, rows.columns
+    else:
+        keys = tuple(rows[0]) if rows else tuple(sorted(node._keys, key=repr))
+        columns = [[row[k] for row in rows] for k in keys]
+    return keys, tuple(tuple(map(_identity, column)) for column in columns)
+
+
+def _register(key, node):
+    # A canonical node made from an interned copy does not need its origin.
+    node.__dict__.pop("_canonical", None)
+    _nodes[key] = node
+    _canonical_ids[id(node)] = node
+    return node
+
+
+def _canonical_leaf(node):
+    by_storage = ("storage", id(node._left), frozenset(node._keys))
+    found = _nodes.get(by_storage)
+    if found is not None:
+        return found
+    keys, content = _leaf_content(node)
+    by_content = ("leaf", keys, len(node._left), hash(content))
+    found = _nodes.get(by_content)
+    if found is not None:
+        # Tell apart hash collisions.
+        return found if _leaf_content(found) == (keys, content) else None
+    # The copy also takes away any ownership of the storage (see
+    # `Cycler.extend`), so the canonical leaf is never modified.
+    canonical = _register(by_content, node._shallow_copy())
+    return _register(
+        ("storage", id(canonical._left), frozenset(canonical._keys)), canonical)
+
+
+def _canonical(node):
+    """The canonical node with the same rows as *node*, or None."""
+    if _canonical_ids.get(id(node)) is node:
+        return node
+    if node._is_view():
+        op = node._op
+        if type(op) is range:
+            index = op
+        elif type(op) is _Radix:
+            index = op.__reduce__()[1]
+        else:
+            # Other index sequences are not compared by value.
+            return None
+        child = _canonical(node._left)
+        if child is None:
+            return None
+        key = ("view", id(child), type(op), index)
+        parts = (child, None, op)
+    elif node._right is None:
+        if isinstance(node._left, Cycler):
+            return _canonical(node._left)
+        return _canonical_leaf(node)
+    else:
+        left = _canonical(node._left)
+        right = _canonical(node._right)
+        if left is None or right is None:
+            return None
+        key = (node._op, id(left), id(right))
+        parts = (left, right, node._op)
+    found = _nodes.get(key)
+    if found is not None:
+        return found
+    return _register(key, Cycler._from_parts(*parts, node._keys))
+
+
+def intern(cyc):
+    canonical = _canonical(cyc)
+    if canonical is None:
+        return cyc._shallow_copy()
+    ret = canonical._shallow_copy()
+    # The registries only hold weak references.  This one is passed on to
+    # the copies of *ret*, which share the same parts.
+    ret._canonical = canonical
+    return ret
@@ -0,0 +1,157 @@
+"""
+Saving `Cycler` objects to, and loading them from, disk, and exporting their
+rows.
+
+A saved cycler is a directory holding ``cycler.pkl``, a pickled description
+of the composition tree, and one file per leaf key: a ``.npy`` array for
+columns of bools, ints or floats (which can be memory mapped on load, and read
+by `numpy.load`) and a pickled list for anything else.
+"""
+
+import os
+import pickle
+
+from . import Cycler, product
+from ._columns import (
+    _ColumnRows, _MappedColumn, _binary_dtype, _write_npy)
+
+_HEADER = "cycler.pkl"
+_FORMAT_VERSION = 1
+
+
+def _leaf_columns(rows, keys):
+    """The (keys, columns) of the rows of a leaf."""
+    if isinstance(rows, _ColumnRows):
+        return rows.keys, [rows.column(k) for k in rows.keys]
+    keys = tuple(keys)
+    return keys, [[row[k] for row in rows] for k in keys]
+
+
+def _write(filename, write):
+    """
+    Write *filename* with ``write(f)`` through a temporary file that then
+    replaces it, so that cyclers with the previous file memory mapped keep
+    their values.
+    """
+    temporary = filename + ".tmp"
+    try:
+        with open(temporary, "wb") as f:
+            write(f)
+        os.replace(temporary, filename)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _describe(node, path, files):
+    """Write the leaves of *node* below *path*; return the tree description."""
+    if node._is_view():
+        return ("view", _describe(node._left, path, files), node._op)
+    if node._right is None:
+        if isinstance(node._left, Cycler):
+            return _describe(node._left, path, files)
+        keys, columns = _leaf_columns(node._left, node._keys)
+        names = []
+        for column in columns:
+            values = list(column)
+            dtype = _binary_dtype(values)
+            name = f"{len(files)}.npy" if dtype else f"{len(files)}.pkl"
+            files.append(name)
+            filename = os.path.join(path, name)
+            if dtype:
+                _write(filename, lambda f: _write_npy(f, values, *dtype))
+            else:
+                _write(filename, lambda f: pickle.dump(
+                    values, f, pickle.HIGHEST_PROTOCOL))
+            names.append(name)
+        return ("leaf", keys, tuple(names), len(node._left))
+    op = "product" if node._op is product else "zip"
+    return (op, _describe(node._left, path, files),
+            _describe(node._right, path, files))
+
+
+def save(cyc, path):
+    os.makedirs(path, exist_ok=True)
+    tree = _describe(cyc, path, [])
+    header = {"version": _FORMAT_VERSION, "tree": tree}
+    _write(os.path.join(path, _HEADER),
+           lambda f: pickle.dump(header, f, pickle.HIGHEST_PROTOCOL))
+
+
+def _build(tree, path, mmap):
+    kind = tree[0]
+    if kind == "view":
+        source = _build(tree[1], path, mmap)
+        return Cycler._from_parts(source, None, tree[2], source._keys)
+    if kind == "leaf":
+        _, keys, names, length = tree
+        columns = []
+        for name in names:
+            filename = os.path.join(path, name)
+            if name.endswith(".npy"):
+                columns.append(_MappedColumn(filename, mmap=mmap))
+            else:
+                with open(filename, "rb") as f:
+                    columns.append(pickle.load(f))
+        if not keys:
+            return Cycler._from_parts([{}] * length, None, None, set())
+        return Cycler._from_parts(
+            _ColumnRows(keys, columns), None, None, set(keys))
+    left = _build(tree[1], path, mmap)
+    right = _build(tree[2], path, mmap)
+    return Cycler._from_parts(left, right, product if kind == "product" else zip,
+                              left._keys | right._keys)
+
+
+def load(path, mmap=True):
+    with open(os.path.join(path, _HEADER), "rb") as f:
+        header = pickle.load(f)
+    if header.get("version") != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported cycler file format in {path}")
+    return _build(header["tree"], path, mmap)
+
+
+def _chunks(cyc, keys, chunksize):
+    """Yield lists of up to *chunksize* tuples of row values, in *keys* order."""
+    from itertools import islice
+
+    rows = (tuple(row[k] for k in keys) for row in cyc)
+    while chunk := list(islice(rows, chunksize)):
+        yield chunk
+
+
+def _ordered_keys(cyc, keys):
+    if keys is None:
+        return sorted(cyc.keys, key=repr)
+    keys = list(keys)
+    if set(keys) != cyc.keys:
+        raise ValueError(
+            f"keys must be the keys of the cycler, {cyc.keys!r}, not {keys!r}")
+    return keys
+
+
+def write_csv(cyc, fileobj, keys, chunksize, **fmtparams):
+    import csv
+
+    keys = _ordered_keys(cyc, keys)
+    writer = csv.writer(fileobj, **fmtparams)
+    writer.writerow(keys)
+    n = 0
+    for chunk in _chunks(cyc, keys, chunksize):
+        writer.writerows(chunk)
+        n += len(chunk)
+    return n
+
+
+def write_jsonl(cyc, fileobj, keys, chunksize, **dumps_kwargs):
+    import json
+
+    keys = _ordered_keys(cyc, keys)
+    n = 0
+    for chunk in _chunks(cyc, keys, chunksize):
+        fileobj.write("".join(
+            json.dumps(dict(zip(keys, values)), **dumps_kwargs) + "\n"
+            for values in chunk))
+        n += len(chunk)
+    return n
@@ -0,0 +1,217 @@
+"""
+Memory usage of `Cycler` objects.
+
+The composition tree is walked once, measuring each node and the storage
+it holds (leaf values, view index sequences) with `sys.getsizeof`.  Storage
+referenced from more than one place in the tree is only counted once in the
+totals.
+
+Storage is *shared* when more than one cycler holds it, in the tree or
+elsewhere, e.g. in a copy of a part of the tree: `Cycler._extend` would then
+have to copy it, see `Cycler._own_parts`.  Its holders are found with
+`gc.get_referrers`, which scans every object tracked by the garbage
+collector, so this is only done by `describe`.
+"""
+
+from array import array
+import gc
+import sys
+
+from . import Cycler, product
+from ._columns import _ColumnRows, _DictColumn, _MappedColumn, _RunColumn
+from ._views import _Filtered, _Permutation, _Radix
+
+
+def _values_bytes(values, deep, seen):
+    """Size of the distinct, not yet *seen*, objects in *values*."""
+    if not deep:
+        return 0
+    total = 0
+    for v in values:
+        if id(v) not in seen:
+            seen.add(id(v))
+            total += sys.getsizeof(v)
+    return total
+
+
+def _storage_bytes(obj, deep, seen):
+    """Heap size of leaf storage or an index sequence, see `_memory_tree`."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, _DictColumn):
+        return (size + sys.getsizeof(obj.table) + sys.getsizeof(obj.codes)
+                + _values_bytes(obj.table, deep, seen))
+    if isinstance(obj, _RunColumn):
+        return (size + sys.getsizeof(obj.values) + sys.getsizeof(obj.ends)
+                + _values_bytes(obj.values, deep, seen))
+    if isinstance(obj, _MappedColumn):
+        # The values live in the page cache, not on the heap.
+        return size
+    if isinstance(obj, _Filtered):
+        positions = obj._positions
+        return size + (sys.getsizeof(positions) if positions is not None else 0)
+    if isinstance(obj, (range, array, _Radix, _Permutation)):
+        return size
+    if isinstance(obj, list):
+        if obj and isinstance(obj[0], dict):  # rows
+            return size + sum(
+                sys.getsizeof(row) + _values_bytes(row.values(), deep, seen)
+                for row in obj)
+        return size + _values_bytes(obj, deep, seen)
+    return size
+
+
+def _node_kind(node):
+    if node._is_view():
+        return "view"
+    if node._right is not None:
+        return "product" if node._op is product else "zip"
+    return "wrapper" if isinstance(node._left, Cycler) else "leaf"
+
+
+def _storage_of(node):
+    """
+    The objects holding the values or row positions of *node*, and the size
+    of their containers.
+    """
+    kind = _node_kind(node)
+    if kind == "view":
+        return [node._op], 0
+    if kind == "leaf":
+        if isinstance(node._left, _ColumnRows):
+            # Columns are shared between leaves when renaming keys.
+            rows = node._left
+            return list(rows.columns), (sys.getsizeof(rows)
+                                        + sys.getsizeof(rows.columns))
+        return [node._left], 0
+    return [], 0
+
+
+def _holders(objs, kind, holds=None):
+    """
+    Count, for each of *objs*, the objects of type *kind* referring to it, for
+    which *holds* is true if given.
+
+    Returns a dict mapping the ids of *objs* to their count.
+    """
+    counts = dict.fromkeys(map(id, objs), 0)
+    for referrer in gc.get_referrers(*objs):
+        if type(referrer) is kind and (holds is None or holds(referrer)):
+            for obj in gc.get_referents(referrer):
+                if id(obj) in counts:
+                    counts[id(obj)] += 1
+    return counts
+
+
+def _shared_storage(nodes):
+    """
+    The ids of the storage of *nodes* held by more than one cycler.
+
+    Leaf rows and view index sequences are held by the ``__dict__`` of the
+    nodes using them, leaf columns by the `_ColumnRows` of those nodes, via
+    their tuple of columns.
+    """
+    parts = [node._op if node._is_view() else node._left for node in nodes
+             if node._is_view() or _node_kind(node) == "leaf"]
+    if not parts:
+        return set()
+    # Other dicts, such as module globals, do not make the storage shared.
+    counts = _holders(parts, dict, lambda d: "_keys" in d)
+    columns = {id(c) for part in parts if isinstance(part, _ColumnRows)
+               for c in part.columns}
+    if columns:
+        tuples = [t for t in gc.get_referrers(*(
+            c for part in parts if isinstance(part, _ColumnRows)
+            for c in part.columns)) if type(t) is tuple]
+        tuple_counts = _holders(tuples, _ColumnRows) if tuples else {}
+        for t in tuples:
+            for c in t:
+                if id(c) in columns:
+                    counts[id(c)] = counts.get(id(c), 0) + tuple_counts[id(t)]
+    return {key for key, count in counts.items() if count > 1}
+
+
+def _memory_tree(cyc, deep, shared=False):
+    """
+    Measure *cyc*.
+
+    Returns a list of ``(depth, kind, node, node_bytes, storage_bytes,
+    shared)`` tuples in depth first order, where *storage_bytes* is None for
+    nodes without storage and, if *shared*, *shared* tells whether some of
+    the storage is held by another cycler, see `_shared_storage`.
+    """
+    nodes = []
+    stack = [(0, cyc)]
+    while stack:
+        depth, node = stack.pop()
+        nodes.append((depth, node))
+        children = [node._right, node._left]
+        stack.extend((depth + 1, child) for child in children
+                     if isinstance(child, Cycler))
+    shared_ids = _shared_storage([node for _, node in nodes]) if shared else ()
+
+    seen = set()
+    records = []
+    for depth, node in nodes:
+        node_bytes = (sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+                      + sys.getsizeof(node._keys))
+        storages, container_bytes = _storage_of(node)
+        storage_bytes = None
+        kind = _node_kind(node)
+        # The rows of a leaf may be shared even where its columns are not.
+        is_shared = kind == "leaf" and id(node._left) in shared_ids
+        if storages:
+            storage_bytes = container_bytes
+            for storage in storages:
+                is_shared = is_shared or id(storage) in shared_ids
+                if id(storage) not in seen:
+                    seen.add(id(storage))
+                    storage_bytes += _storage_bytes(storage, deep, seen)
+        records.append(
+            (depth, kind, node, node_bytes, storage_bytes, is_shared))
+    return records
+
+
+def memory_usage(cyc, deep):
+    return sum(node_bytes + (storage_bytes or 0)
+               for *_, node_bytes, storage_bytes, _ in _memory_tree(cyc, deep))
+
+
+def _format_bytes(n):
+    for unit in ("B", "kB", "MB", "GB"):
+        if n < 1000 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1000
+
+
+_STORAGE_NAMES = {
+    _DictColumn: "dict encoded",
+    _RunColumn: "run-length encoded",
+    _MappedColumn: "memory mapped",
+}
+
+
+def _storage_name(storages):
+    return ", ".join(_STORAGE_NAMES.get(type(s), type(s).__name__.lstrip("_"))
+                     for s in storages)
+
+
+def describe(cyc, deep):
+    records = _memory_tree(cyc, deep, shared=True)
+    lines = []
+    shared_bytes = 0
+    for depth, kind, node, node_bytes, storage_bytes, shared in records:
+        line = (f"{'  ' * depth}{kind} keys={sorted(node._keys, key=repr)!r} "
+                f"len={len(node)} node={_format_bytes(node_bytes)}")
+        if storage_bytes is not None:
+            storages, _ = _storage_of(node)
+            line += (f" storage={_format_bytes(storage_bytes)}"
+                     f" ({_storage_name(storages)}{', shared' if shared else ''})")
+            if shared:
+                shared_bytes += storage_bytes
+        lines.append(line)
+    total = sum(r[3] + (r[4] or 0) for r in records)
+    lines.append(
+        f"total {_format_bytes(total)} in {len(records)} nodes, "
+        f"depth {max(r[0] for r in records) + 1}, "
+        f"{_format_bytes(shared_bytes)} in shared storage")
+    return "\n".join(lines)
@@ -0,0 +1,106 @@
+"""
+Mapping a function over the rows of a `Cycler` with an executor, see
+`Cycler.map_parallel`.
+
+Tasks are ranges of row numbers rather than rows: each worker decodes the
+rows of its range from the composition tree, which is pickled once by the
+parent and unpickled once per worker process.  A process pool created by
+`map_parallel` receives the tree once per worker, through its initializer;
+executors passed by the caller have no such channel to their workers, so
+the pickled tree is sent along with each of their tasks.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait)
+import os
+import pickle
+
+from . import Cycler
+
+# The trees unpickled by this (worker) process, by token.
+_trees: dict[str, Cycler] = {}
+_MAX_TREES = 4
+
+
+def _load_tree(tree):
+    """
+    The cycler of a task: *tree* is a cycler, or a token and the pickled
+    cycler, which is None if the worker received it when it started.
+    """
+    if isinstance(tree, Cycler):
+        return tree
+    token, payload = tree
+    cyc = _trees.get(token)
+    if cyc is None:
+        if len(_trees) >= _MAX_TREES:
+            _trees.pop(next(iter(_trees)))
+        cyc = _trees[token] = pickle.loads(payload)
+    return cyc
+
+
+def _run_chunk(tree, func, start, stop):
+    cyc = _load_tree(tree)
+    return [func(cyc._row(i)) for i in range(start, stop)]
+
+
+def _collect(pending, ordered):
+    """
+    Yield the results of the first of the *pending* chunks or, if not
+    *ordered*, of those that are done first.
+    """
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield from future.result()
+
+
+def _map(cyc, func, executor, chunksize, ordered, max_in_flight):
+    n = len(cyc)
+    own_executor = executor is None
+    if isinstance(executor, ThreadPoolExecutor):
+        # Threads share the tree.
+        tree = cyc
+    else:
+        from uuid import uuid4
+
+        token = uuid4().hex
+        payload = pickle.dumps(cyc, pickle.HIGHEST_PROTOCOL)
+        if own_executor:
+            executor = ProcessPoolExecutor(
+                initializer=_load_tree, initargs=((token, payload),))
+            payload = None
+        tree = (token, payload)
+    pending = deque()
+    try:
+        for start in range(0, n, chunksize):
+            if len(pending) >= max_in_flight:
+                yield from _collect(pending, ordered)
+            stop = min(start + chunksize, n)
+            pending.append(executor.submit(_run_chunk, tree, func, start, stop))
+        while pending:
+            yield from _collect(pending, ordered)
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            # The pending tasks are cancelled already.
+            executor.shutdown()
+
+
+def map_parallel(cyc, func, executor, chunksize, ordered, max_in_flight):
+    workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(1024, -(-len(cyc) // (4 * workers))))
+    elif chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, not {chunksize}")
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    elif max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be at least 1, not {max_in_flight}")
+    return _map(cyc, func, executor, chunksize, ordered, max_in_flight)
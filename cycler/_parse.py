@@ -0,0 +1,107 @@
+"""
+Parsing of cycler expressions, see `cycler.parse`.
+
+The text is parsed with `ast` and the tree is walked to build the `Cycler`
+directly; nothing is evaluated besides literals (with `ast.literal_eval`),
+so it is safe to use on untrusted text.  Building the tree is cheap, as
+compositions are lazy, except where rows are copied: by `concat`, or by a
+cycler made from another one.  The rows copied are limited to `_MAX_ROWS`,
+as are integer multipliers.
+"""
+
+import ast
+from functools import lru_cache
+import operator
+
+from . import Cycler, concat, cycler
+
+_OPERATORS = {ast.Add: operator.add, ast.Mult: operator.mul}
+
+_MAX_ROWS = 10**6
+
+
+def _error(node, text, reason):
+    snippet = ast.get_source_segment(text, node) or ast.dump(node)
+    return ValueError(f"{reason} in cycler expression: {snippet!r}")
+
+
+def _argument(node, text):
+    """A cycler expression or a literal."""
+    if isinstance(node, (ast.BinOp, ast.Call, ast.Subscript)):
+        return _build(node, text)
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        raise _error(node, text, "Unsupported argument") from None
+
+
+def _build(node, text):
+    if isinstance(node, ast.BinOp):
+        op = _OPERATORS.get(type(node.op))
+        if op is None:
+            raise _error(node, text, "Unsupported operator")
+        left, right = (_argument(n, text) for n in (node.left, node.right))
+        if not isinstance(left, Cycler) and not isinstance(right, Cycler):
+            raise _error(node, text, "Expected a cycler operand")
+        if any(type(n) is int and n > _MAX_ROWS for n in (left, right)):
+            raise _error(node, text, f"Multiplier above {_MAX_ROWS}")
+        try:
+            return op(left, right)
+        except TypeError:
+            raise _error(node, text, "Unsupported operands") from None
+    if isinstance(node, ast.Call):
+        func = node.func
+        args = [_argument(n, text) for n in node.args]
+        kwargs = {}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise _error(node, text, "Unsupported ** argument")
+            kwargs[keyword.arg] = _argument(keyword.value, text)
+        if isinstance(func, ast.Name) and func.id == "cycler":
+            # A cycler is copied as it is, otherwise the rows are copied.
+            copied = args[1:] if len(args) > 1 else list(kwargs.values())
+            constructor = cycler
+        elif isinstance(func, ast.Name) and func.id == "concat" and not kwargs:
+            copied = args
+            constructor = concat
+        elif (isinstance(func, ast.Attribute) and func.attr == "concat"
+                and not kwargs):
+            args.insert(0, _build(func.value, text))
+            copied = args
+            constructor = concat
+        else:
+            raise _error(node, text, "Unsupported call")
+        if sum(len(a) for a in copied if isinstance(a, Cycler)) > _MAX_ROWS:
+            raise _error(node, text, f"Copy of more than {_MAX_ROWS} rows")
+        try:
+            return constructor(*args, **kwargs)
+        except TypeError as err:
+            raise _error(node, text, f"Invalid arguments ({err})") from None
+    if isinstance(node, ast.Subscript):
+        value = _build(node.value, text)
+        if not isinstance(node.slice, ast.Slice):
+            raise _error(node, text, "Only slices are supported")
+        bounds = (node.slice.lower, node.slice.upper, node.slice.step)
+        try:
+            return value[slice(*(None if n is None else _argument(n, text)
+                                 for n in bounds))]
+        except TypeError:
+            raise _error(node, text, "Slice bounds must be integers") from None
+    raise _error(node, text, "Unsupported syntax")
+
+
+@lru_cache(maxsize=256)
+def _parse(text):
+    # Parenthesized, so that the expression can span several lines.
+    source = f"({text.strip()}\n)"
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as err:
+        raise ValueError(f"Invalid cycler expression {text!r}: {err.msg}") from None
+    return _build(tree.body, source)
+
+
+def parse(text):
+    if not isinstance(text, str):
+        raise TypeError(f"Expected a str, not {type(text).__name__}")
+    return _parse(text)._shallow_copy()
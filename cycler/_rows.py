@@ -0,0 +1,231 @@
+"""
+Read-only row views and delta iteration, see `Cycler.row_views` and
+`Cycler.iter_deltas`.
+
+Iterating over a `Cycler` builds a new dict per row.  A row view is instead a
+row number and a shared *plan*: for each key, a function computing the value
+of the key in any row of the cycler from the columns of the leaves.  Values
+are only looked up when accessed.
+
+The position of a row in the leaf holding a key is derived arithmetically
+while walking down the tree: the rows of a product's left operand are
+repeated ``len(right)`` times and those of its right operand are tiled, so
+below any chain of products the position in the leaf is
+``(i // div) % mod`` for constants *div* and *mod*.  Views and operands that
+do not divide their parent's rows evenly add an explicit index function.
+"""
+
+from collections.abc import Mapping
+
+from . import Cycler, product
+
+
+def _position(index, div, mod):
+    """The function ``i -> (index(i) // div) % mod``, or None for identity."""
+    if index is None:
+        if mod is None:
+            return None if div == 1 else (lambda i: i // div)
+        return (lambda i: i % mod) if div == 1 else (lambda i: i // div % mod)
+    if mod is None:
+        return index if div == 1 else (lambda i: index(i) // div)
+    return lambda i: index(i) // div % mod
+
+
+def _leaf_getter(fetch, index, div, mod):
+    position = _position(index, div, mod)
+    if position is None:
+        return fetch
+    return lambda i: fetch(position(i))
+
+
+def _paths(node, index=None, div=1, mod=None):
+    """
+    List of ``(key, fetch, index, div, mod)`` for the keys of *node*, in row
+    order.
+
+    The value of the key in row *i* of the root cycler is ``fetch(j)`` for
+    the position ``j = (index(i) // div) % mod`` in its leaf, with no *index*
+    meaning the identity and no *mod* meaning that the result is always
+    within the leaf.  This node is at that position, given the arguments.
+    """
+    if node._is_view():
+        op = node._op
+        from ._views import _Radix
+
+        period = op._div * op._mod if type(op) is _Radix else 0
+        # The moduli are 0 when there are no rows, and so nothing to look up.
+        if period and (mod is None or mod % period == 0):
+            return _paths(node._left, index, div * op._div, op._mod)
+        position = _position(index, div, mod)
+        lookup = op.__getitem__
+        if position is None:
+            return _paths(node._left, lookup)
+        return _paths(node._left, lambda i: lookup(position(i)))
+    if node._right is None:
+        rows = node._left
+        if isinstance(rows, Cycler):
+            return _paths(rows, index, div, mod)
+        if hasattr(rows, "column"):
+            return [(k, rows.column(k).__getitem__, index, div, mod)
+                    for k in rows.keys]
+        if not rows:
+            return []
+        return [(k, lambda j, k=k: rows[j][k], index, div, mod)
+                for k in rows[0]]
+    if node._op is not product:
+        # The rows of a zip are those of its operands.
+        return (_paths(node._left, index, div, mod)
+                + _paths(node._right, index, div, mod))
+    n = len(node._right)
+    if mod is not None and (not n or mod % n):
+        index, div, mod = _position(index, div, mod), 1, None
+    return (_paths(node._left, index, div * n, None if mod is None else mod // n)
+            + _paths(node._right, index, div, n))
+
+
+class _Plan:
+    """The keys of a cycler, in row order, and the getters of their values."""
+
+    __slots__ = ("keys", "getters")
+
+    def __init__(self, cyc):
+        paths = _paths(cyc)
+        self.keys = tuple(path[0] for path in paths)
+        self.getters = {key: _leaf_getter(*path) for key, *path in paths}
+
+    def row(self, i):
+        """Row *i* of the cycler, as a new dict."""
+        return {key: getter(i) for key, getter in self.getters.items()}
+
+
+class RowView(Mapping):
+    """
+    Read-only mapping of the keys of a row of a `Cycler` to their values.
+
+    The values are looked up from the cycler's columns on access.
+    """
+
+    __slots__ = ("_plan", "_i")
+
+    def __init__(self, plan, i):
+        self._plan = plan
+        self._i = i
+
+    def __getitem__(self, key):
+        return self._plan.getters[key](self._i)
+
+    def __iter__(self):
+        return iter(self._plan.keys)
+
+    def __len__(self):
+        return len(self._plan.keys)
+
+    def __contains__(self, key):
+        return key in self._plan.getters
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+def row_views(cyc):
+    from itertools import repeat
+
+    return map(RowView, repeat(_Plan(cyc)), range(len(cyc)))
+
+
+def _groups(paths):
+    """
+    Group *paths* by position: a list of ``(index, div, mod, keys)`` where
+    *keys* is a list of the ``(key, fetch)`` pairs whose values come from the
+    same position of their leaves, and so change together.
+    """
+    groups = {}
+    for key, fetch, index, div, mod in paths:
+        groups.setdefault((index, div, mod), []).append((key, fetch))
+    return [(*where, keys) for where, keys in groups.items()]
+
+
+def _gray_digits(groups, n):
+    """
+    The ``(radix, keys)`` of each digit of the mixed-radix rows, innermost
+    first, or raise ValueError if the rows are not a product of leaves.
+    """
+    if not n:
+        return []
+    digits = []
+    size = 1
+    for index, div, mod, keys in sorted(groups, key=lambda g: g[1]):
+        radix = n // div if mod is None else mod
+        if radix == 1:
+            continue
+        if index is not None or div != size:
+            raise ValueError(
+                "Gray code order is only defined for products of leaves"
+            )
+        digits.append((radix, keys))
+        size *= radix
+    if size != n:
+        raise ValueError("Gray code order is only defined for products of leaves")
+    return digits
+
+
+def _first_row(groups):
+    return {key: _leaf_getter(fetch, index, div, mod)(0)
+            for index, div, mod, keys in groups for key, fetch in keys}
+
+
+def _gray_deltas(groups, digits, n):
+    if not n:
+        return
+    yield _first_row(groups)
+    # Reflected Gray code: move the innermost digit that can go on in its
+    # direction, reversing the directions of those that cannot.
+    position = [0] * len(digits)
+    step = [1] * len(digits)
+    for _ in range(n - 1):
+        d = 0
+        while not 0 <= position[d] + step[d] < digits[d][0]:
+            step[d] = -step[d]
+            d += 1
+        position[d] += step[d]
+        yield {key: fetch(position[d]) for key, fetch in digits[d][1]}
+
+
+def _deltas(groups, n):
+    if not n:
+        return
+    yield _first_row(groups)
+    # The position of keys without an index changes every div rows.
+    radix = sorted(((div, mod, keys) for index, div, mod, keys in groups
+                    if index is None and mod != 1), key=lambda g: g[0])
+    # Products nest their operands, so if a row is not a multiple of a div
+    # it is not a multiple of the larger ones either.
+    nested = all(b[0] % a[0] == 0 for a, b in zip(radix, radix[1:]))
+    indexed = [(_position(index, div, mod), keys)
+               for index, div, mod, keys in groups if index is not None]
+    previous = [position(0) for position, _ in indexed]
+    for i in range(1, n):
+        delta = {}
+        for div, mod, keys in radix:
+            if i % div:
+                if nested:
+                    break
+                continue
+            j = i // div if mod is None else i // div % mod
+            for key, fetch in keys:
+                delta[key] = fetch(j)
+        for g, (position, keys) in enumerate(indexed):
+            j = position(i)
+            if j != previous[g]:
+                previous[g] = j
+                for key, fetch in keys:
+                    delta[key] = fetch(j)
+        yield delta
+
+
+def iter_deltas(cyc, gray=False):
+    n = len(cyc)
+    groups = _groups(_paths(cyc))
+    if gray:
+        return _gray_deltas(groups, _gray_digits(groups, n), n)
+    return _deltas(groups, n)
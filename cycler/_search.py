@@ -0,0 +1,126 @@
+"""
+Finding the first occurrence of a row in a `Cycler`, see `Cycler.index`.
+
+`Cycler._positions` lists every occurrence of a row, which in tiled or
+repeated cyclers can be far more than are needed to find the first one.
+Here occurrences are instead searched for from a bound, in either
+direction: a product combines the nearest positions in its operands
+arithmetically, a zip seeks each operand in turn to the position found in
+the other until they agree, and range and `_Radix` views map the bound to
+their source and the position found there back.  Other views fall back to
+listing the occurrences in their source.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from . import Cycler, product
+from ._views import _Radix, _preimage
+
+
+def _nearest(positions, bound, forward):
+    """The nearest of the sorted *positions* from *bound*, or None."""
+    if forward:
+        k = bisect_left(positions, bound)
+        return positions[k] if k < len(positions) else None
+    k = bisect_right(positions, bound)
+    return positions[k - 1] if k else None
+
+
+def _seek_range(source, row, op, bound, forward):
+    # Positions i of the view hold the source positions op.start + i * op.step.
+    source_forward = forward == (op.step > 0)
+    i = bound
+    while True:
+        j = _seek(source, row, op[i], source_forward)
+        if j is None:
+            return None
+        i, remainder = divmod(j - op.start, op.step)
+        if remainder and forward:
+            i += 1
+        if not 0 <= i < len(op):
+            return None
+        if not remainder:
+            return i
+
+
+def _seek_radix(source, row, op, bound, forward):
+    # Position i of the view holds the source position (i // div) % mod, so
+    # each period of div * mod positions holds every source position once.
+    div, mod = op._div, op._mod
+    period, rem = divmod(bound, div * mod)
+    if forward:
+        j = _seek(source, row, rem // div, True)
+        if j is not None and j < mod:
+            i = period * div * mod + max(j * div, rem)
+        else:
+            j = _seek(source, row, 0, True)
+            if j is None or j >= mod:
+                return None
+            i = (period + 1) * div * mod + j * div
+        return i if i < len(op) else None
+    j = _seek(source, row, rem // div, False)
+    if j is not None:
+        return period * div * mod + min(j * div + div - 1, rem)
+    j = _seek(source, row, mod - 1, False)
+    if j is None or not period:
+        return None
+    return (period - 1) * div * mod + j * div + div - 1
+
+
+def _seek(node, row, bound, forward):
+    """
+    The first position of *row* in *node* at or after *bound* if *forward*,
+    else the last one at or before it, or None.
+
+    *row* has exactly the keys of *node*.
+    """
+    n = len(node)
+    bound = max(bound, 0) if forward else min(bound, n - 1)
+    if not 0 <= bound < n:
+        return None
+    if node._is_view():
+        op = node._op
+        if type(op) is range:
+            return _seek_range(node._left, row, op, bound, forward)
+        if type(op) is _Radix:
+            return _seek_radix(node._left, row, op, bound, forward)
+        positions = _preimage(op, node._left._positions(row))
+        return _nearest(positions, bound, forward)
+    if node._right is None:
+        if isinstance(node._left, Cycler):
+            return _seek(node._left, row, bound, forward)
+        return _nearest(node._leaf_positions(row), bound, forward)
+    left_row = {k: row[k] for k in node._left._keys}
+    right_row = {k: row[k] for k in node._right._keys}
+    if node._op is product:
+        m = len(node._right)
+        step = 1 if forward else -1
+        i = _seek(node._left, left_row, bound // m, forward)
+        if i == bound // m:
+            j = _seek(node._right, right_row, bound % m, forward)
+            if j is not None:
+                return i * m + j
+            i = _seek(node._left, left_row, i + step, forward)
+        if i is None:
+            return None
+        j = _seek(node._right, right_row, 0 if forward else m - 1, forward)
+        return None if j is None else i * m + j
+    # A zip: leapfrog the operands to a position where both hold the row.
+    while 0 <= bound < n:
+        i = _seek(node._left, left_row, bound, forward)
+        if i is None:
+            return None
+        j = _seek(node._right, right_row, i, forward)
+        if j is None:
+            return None
+        if i == j:
+            return i
+        bound = j
+    return None
+
+
+def first_position(cyc, row):
+    """The first position of *row* in *cyc*, or None."""
+    if row.keys() != cyc._keys:
+        return None
+    return _seek(cyc, row, 0, True)
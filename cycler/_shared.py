@@ -0,0 +1,53 @@
+"""
+Cycling over the rows of a `Cycler` from several threads, see
+`Cycler.shared_cycle`.
+"""
+
+from threading import Lock
+
+from ._rows import _Plan
+
+
+class SharedCycle:
+    """
+    Iterator cycling over the rows of a `Cycler`, safe to advance from any
+    number of threads.
+
+    Only the position in the cycle is protected by a lock; the rows are
+    computed by each thread, outside of it, from their position with the
+    plan used by `Cycler.row_views`.  Unlike `itertools.cycle` nothing is
+    buffered.
+    """
+
+    __slots__ = ("_plan", "_length", "_position", "_lock")
+
+    def __init__(self, cyc):
+        self._plan = _Plan(cyc)
+        self._length = len(cyc)
+        self._position = 0
+        self._lock = Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._length:
+            raise StopIteration
+        with self._lock:
+            i = self._position
+            self._position = 0 if i + 1 == self._length else i + 1
+        return self._plan.row(i)
+
+    @property
+    def position(self):
+        """The position in the cycle of the next row."""
+        return self._position
+
+    def reset(self, position=0):
+        """Continue the cycle from the row at *position*."""
+        with self._lock:
+            self._position = position % self._length if self._length else 0
+
+    def __repr__(self):
+        return (f"<{type(self).__name__} at position {self._position} "
+                f"of {self._length}>")
@@ -0,0 +1,207 @@
+"""
+Index sequences used by view nodes.
+
+A view node is a `Cycler` whose ``_left`` is the source `Cycler`, whose
+``_right`` is None and whose ``_op`` is a sequence of row indices into the
+source.  Any sequence of ints with a length works (`range` objects are used
+where possible since they slice and reverse in O(1)); the classes here compute
+their items arithmetically so that views never store one entry per row.
+"""
+
+
+class _Radix:
+    """
+    The sequence ``(i // div) % mod for i in range(length)``.
+
+    With ``mod`` at least ``length // div`` this repeats each source row
+    ``div`` times, with ``div == 1`` it tiles the source rows.  These are the
+    positions of a product operand's rows in the rows of the product.
+    """
+
+    __slots__ = ("_length", "_div", "_mod")
+
+    def __init__(self, length, div, mod):
+        self._length = length
+        self._div = div
+        self._mod = mod
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("index out of range")
+        return (i // self._div) % self._mod
+
+    def __iter__(self):
+        return map(self.__getitem__, range(self._length))
+
+    def take(self, values):
+        """
+        Iterate over ``source[i] for i in self``, given an iterator over the
+        *values* of the source in order (of which at least ``mod`` are used).
+        """
+        from itertools import chain, cycle, islice, repeat
+
+        values = islice(values, self._mod)
+        if self._div > 1:
+            values = chain.from_iterable(map(repeat, values, repeat(self._div)))
+        if self._length > self._div * self._mod:
+            values = cycle(values)
+        return islice(values, self._length)
+
+    def preimage(self, j):
+        """The positions holding the source index *j*, in increasing order."""
+        period = self._div * self._mod
+        return [
+            i
+            for start in range(j * self._div, self._length, period)
+            for i in range(start, min(start + self._div, self._length))
+        ]
+
+    def __reduce__(self):
+        return type(self), (self._length, self._div, self._mod)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._length}, {self._div}, {self._mod})"
+
+
+class _Permutation:
+    """
+    A pseudo-random permutation of ``range(length)``.
+
+    Items are computed on demand with a Feistel network over the smallest
+    domain of ``4**k`` integers containing ``range(length)``; outputs that
+    fall outside of the range are fed back in ("cycle walking") until they
+    land inside, which keeps the map a bijection.  Memory use is constant.
+    """
+
+    __slots__ = ("_length", "_seed", "_half", "_mask", "_keys")
+    _rounds = 4
+    _injective = True
+
+    def __init__(self, length, seed):
+        from random import Random
+
+        self._length = length
+        self._seed = seed
+        self._half = (max(length - 1, 1).bit_length() + 1) // 2
+        self._mask = (1 << self._half) - 1
+        rng = Random(seed)
+        self._keys = tuple(rng.getrandbits(64) for _ in range(self._rounds))
+
+    def _round(self, value, key):
+        # splitmix64 finaliser keyed by the round key.
+        x = (value * 0x9E3779B97F4A7C15 ^ key) & 0xFFFFFFFFFFFFFFFF
+        x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF
+        x = (x ^ (x >> 27)) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+        return (x ^ (x >> 31)) & self._mask
+
+    def _encrypt(self, x):
+        half, mask = self._half, self._mask
+        left, right = x >> half, x & mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << half) | right
+
+    def _decrypt(self, x):
+        half, mask = self._half, self._mask
+        left, right = x >> half, x & mask
+        for key in reversed(self._keys):
+            left, right = right ^ self._round(left, key), left
+        return (left << half) | right
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("index out of range")
+        i = self._encrypt(i)
+        while i >= self._length:
+            i = self._encrypt(i)
+        return i
+
+    def __iter__(self):
+        return map(self.__getitem__, range(self._length))
+
+    def preimage(self, j):
+        """The position holding the source index *j*, as a list."""
+        if not 0 <= j < self._length:
+            return []
+        j = self._decrypt(j)
+        while j >= self._length:
+            j = self._decrypt(j)
+        return [j]
+
+    def __reduce__(self):
+        return type(self), (self._length, self._seed)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._length}, {self._seed!r})"
+
+
+class _Filtered:
+    """
+    The positions of the rows of *source* passing *test*.
+
+    The positions are found on first use and cached; iterating before then
+    streams them while filling the cache.
+    """
+
+    _injective = True
+
+    def __init__(self, source, test):
+        self._source = source
+        self._test = test
+        self._positions = None
+
+    def _scan(self):
+        positions = []
+        for i, row in enumerate(self._source):
+            if self._test(row):
+                positions.append(i)
+                yield i
+        self._positions = positions
+
+    def _computed(self):
+        if self._positions is None:
+            for _ in self._scan():
+                pass
+        return self._positions
+
+    def __len__(self):
+        return len(self._computed())
+
+    def __getitem__(self, i):
+        return self._computed()[i]
+
+    def __iter__(self):
+        if self._positions is None:
+            return self._scan()
+        return iter(self._positions)
+
+    def __reduce__(self):
+        # The test may not be picklable, its outcome is.
+        return list, (self._computed(),)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._source!r}, {self._test!r})"
+
+
+def _preimage(index, positions):
+    """
+    The positions in *index* holding any of the source *positions*.
+
+    Returns a sorted list.
+    """
+    if isinstance(index, range):
+        return sorted(index.index(j) for j in positions if j in index)
+    if isinstance(index, (_Radix, _Permutation)):
+        return sorted(i for j in positions for i in index.preimage(j))
+    wanted = set(positions)
+    return [i for i, j in enumerate(index) if j in wanted]
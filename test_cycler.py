@@ -1,6 +1,9 @@
 from collections import defaultdict
 from operator import add, iadd, mul, imul
-from itertools import product, cycle, chain
+from itertools import product, cycle, chain, islice
+import os
+import subprocess
+import sys
 
 import pytest  # type: ignore
 
@@ -362,3 +365,1044 @@ def test_contains():
 
     assert 'a' in ab
     assert 'b' in ab
+
+
+def test_import_budget():
+    # Importing cycler must not drag in typing, collections, copy, functools
+    # or anything else heavy; see benchmarks/import_time.py for timings.
+    code = (
+        "import sys; before = set(sys.modules); import cycler; "
+        "print(*sorted(set(sys.modules) - before))"
+    )
+    out = subprocess.run([sys.executable, "-c", code],
+                         capture_output=True, text=True, check=True).stdout
+    allowed = {'cycler', '__future__', 'itertools', 'operator', '_operator'}
+    assert set(out.split()) <= allowed
+
+
+def test_instrument():
+    from cycler import instrument
+
+    c = cycler(c='rgb') * cycler(lw=range(3))
+    # Built separately, so that == compares the rows.
+    d = cycler(c='rgb') * cycler(lw=range(3))
+    orig_iter = Cycler.__iter__
+    with instrument() as stats:
+        c.by_key()
+        assert c == d
+    # Disabled again on exit.
+    assert Cycler.__iter__ is orig_iter
+
+    assert stats.counts['by_key'] == 1
+    # by_key and the left side of the comparison run to completion.
+    assert stats.counts['iter'] == 2
+    assert stats.counts['rows'] == 3 * 9
+    # Each pass allocates a dict per row of the product and of each leaf.
+    assert stats.counts['dicts'] == 3 * (9 + 3 + 3)
+    assert stats.counts['eq_scan'] == 1
+    # Two top-level calls from ==, each recursing into both leaves (the rest
+    # are length hints requested by itertools.product).
+    assert stats.counts['len_recursion'] == 2 * 2
+    assert stats.counts['len'] >= 2 * 3
+    site, = stats.sites['by_key']
+    assert site.startswith(__file__)
+    assert 'by_key' in stats.report()
+
+    # Zips of leaves are built from their columns, without waste.
+    with instrument() as stats:
+        list(cycler(c='rgb') + cycler(lw=range(3)))
+    assert stats.counts['dicts'] == stats.counts['rows'] == 3
+
+    with instrument() as stats:
+        c * cycler(ec='yk')
+    # The leaf plus the product node and its copies of both operands.
+    assert stats.counts['node'] >= 2
+
+
+def test_instrument_environment():
+    code = "from cycler import cycler; cycler(c='rgb').by_key()"
+    proc = subprocess.run([sys.executable, "-c", code],
+                          env={**os.environ, "CYCLER_INSTRUMENT": "1"},
+                          capture_output=True, text=True, check=True)
+    assert 'by_key' in proc.stderr
+
+
+def test_getitem_key():
+    c = (cycler(c='rgb') + cycler(lw=range(3))) * cycler(ec='yk') * cycler(3, 'ab')
+    for key, column in c.by_key().items():
+        assert c[key] == column
+    pytest.raises(ValueError, Cycler.__getitem__, c, 'foo')
+
+
+@pytest.mark.parametrize('keys', [['c'], ['lw'], ['ec'], [3], ['c', 'ec'],
+                                  ['lw', 3], ['c', 'lw', 'ec', 3]])
+def test_select_drop(keys):
+    c = (cycler(c='rgb') + cycler(lw=range(3))) * cycler(ec='yk') * cycler(3, 'ab')
+    target = [{k: row[k] for k in keys} for row in c]
+    selected = c.select(*keys)
+    assert len(selected) == len(c)
+    assert selected.keys == set(keys)
+    assert list(selected) == target
+    assert selected == c.drop(*(c.keys - set(keys)))
+    for k in keys:
+        assert selected[k] == c[k]
+    # The selection is independent of the original.
+    selected.change_key(keys[0], 'new')
+    assert c.keys == {'c', 'lw', 'ec', 3}
+    assert list(c.select(*keys)) == target
+
+
+def test_select_fail():
+    c = cycler(c='rgb') * cycler(lw=range(3))
+    pytest.raises(KeyError, c.select, 'foo')
+    pytest.raises(ValueError, c.select)
+    pytest.raises(KeyError, c.drop, 'foo')
+    pytest.raises(ValueError, c.drop, 'c', 'lw')
+
+
+@pytest.mark.parametrize('c', [
+    cycler(c='rgb') * cycler(lw=range(3)),
+    cycler(c='rgrg') * cycler(lw=[1, 2, 1]),
+    cycler(c='rgr') + cycler(lw=[1, 2, 1]),
+    cycler(c='rgr') + cycler(lw=[1, 2, 3]),
+    cycler(c=[[1], [2], [1]]) * cycler(lw='aba'),
+    (cycler(c='rg') * cycler(lw=[1, 2])).select('c'),
+    cycler(c='rgb')[::2],
+])
+def test_unique(c):
+    target = []
+    for row in c:
+        if row not in target:
+            target.append(row)
+    assert list(c.unique()) == target
+    if c._rows_unique():
+        assert len(target) == len(c)
+
+
+def test_unique_structural(monkeypatch):
+    c = cycler(c='rgb') * (cycler(lw=range(3)) + cycler(ls='-:-'))
+    # Known to be unique without producing any rows.
+    monkeypatch.setattr(Cycler, '__iter__', None)
+    u = c.unique()
+    monkeypatch.undo()
+    assert u == c
+    assert not (cycler(c='rgb') * cycler(lw=[1, 1]))._rows_unique()
+
+
+@pytest.mark.parametrize('c', [
+    cycler(c='rgb') * cycler(lw=range(3)),
+    cycler(c='rgrg') * cycler(lw=[1, 2, 1]),
+    cycler(c='rgr') + cycler(lw=[1, 2, 1]),
+    cycler(c=[[1], [2], [1]]) * cycler(lw='aba'),
+    (cycler(c='rg') * cycler(lw=[1, 2])).select('c'),
+    (cycler(c='rg') * cycler(lw=[1, 2, 3])).select('lw'),
+    (cycler(c='rgrg') + cycler(lw=[1, 2, 1, 2])).unique(),
+    Cycler([{'a': 1, 'b': 2}, {'a': 1, 'b': 3}]) + cycler(c='rg'),
+    (cycler(c='rgb') * cycler(lw=[1, 2, 1]))[::-2],
+    (cycler(c='rg') * 3).window(-3, 10).step(2),
+    (cycler(c='rgb') * cycler(lw=[1, 1])).roll(2) * 2,
+    cycler(c='rgb') * 4 + cycler(lw=[0, 1] * 6),
+    (cycler(c='rgb') * cycler(lw=[1, 2])).shuffled(seed=0),
+])
+def test_index_count(c):
+    rows = list(c)
+    for row in rows:
+        assert c.index(row) == rows.index(row)
+        assert c.count(row) == rows.count(row)
+        assert row in c
+    missing = dict(rows[0], **{next(iter(c.keys)): 'missing'})
+    assert missing not in c
+    assert c.count(missing) == 0
+    pytest.raises(ValueError, c.index, missing)
+    assert {} not in c
+
+
+def test_index_tiled():
+    # Found without listing the billions of occurrences.
+    c = cycler(c='rgb') * 10**9
+    assert c.index({'c': 'g'}) == 1
+    assert c[::-1].index({'c': 'r'}) == 2
+    assert c[-10:].index({'c': 'r'}) == 1
+    assert {'c': 'b', 'lw': 2} in cycler(lw=[1, 2]) * c
+    assert (c + (cycler(lw=[1, 2, 3, 4]) * 10**9)[:len(c)]).index(
+        {'c': 'b', 'lw': 4}) == 11
+    assert {'c': 'k'} not in c.step(7)
+
+
+def test_index_after_change_key():
+    c = cycler(c='rgb') * cycler(lw=range(3))
+    assert c.index({'c': 'b', 'lw': 1}) == 7
+    c.change_key('c', 'color')
+    assert c.index({'color': 'b', 'lw': 1}) == 7
+    assert {'c': 'b', 'lw': 1} not in c
+
+
+def test_sample():
+    c = cycler(c='rgb') * cycler(lw=range(3)) * cycler(ls=['-', '--'])
+    rows = list(c)
+    sample = c.sample(5, seed=42)
+    assert len(sample) == 5
+    assert all(row in rows for row in sample)
+    assert len({tuple(row.items()) for row in sample}) == 5
+    assert c.sample(5, seed=42) == sample
+    assert sorted(map(rows.index, c.sample(len(c)))) == list(range(len(c)))
+    pytest.raises(ValueError, c.sample, len(c) + 1)
+
+    assert c.choice(seed=1) == c.choice(seed=1)
+    assert c.choice() in rows
+    pytest.raises(IndexError, cycler(c=[]).choice)
+
+
+def test_sample_huge():
+    c = cycler(a=range(1000)) * cycler(b=range(1000)) * cycler(c=range(1000))
+    for row in c.sample(10, seed=0):
+        assert c.index(row) < len(c)
+        assert row == c._row(c.index(row))
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 7, 64, 1000])
+def test_shuffled(n):
+    c = cycler(c=range(n))
+    shuffled = c.shuffled(seed=n)
+    assert len(shuffled) == n
+    values = [row['c'] for row in shuffled]
+    assert sorted(values) == list(range(n))
+    if n > 7:
+        assert values != list(range(n))
+    assert list(c.shuffled(seed=n)) == list(shuffled)
+    for row in shuffled:
+        assert values.index(row['c']) == shuffled.index(row)
+    assert shuffled._rows_unique()
+
+
+def test_shuffled_huge():
+    c = cycler(a=range(1000)) * cycler(b=range(1000)) * cycler(c=range(1000))
+    shuffled = c.shuffled(seed=0)
+    first = list(zip(range(100), shuffled))
+    assert len({tuple(row.values()) for _, row in first}) == 100
+    for i, row in first:
+        assert shuffled.index(row) == i
+
+
+@pytest.mark.parametrize('predicates', [
+    {'c': lambda c: c != 'g'},
+    {'c': lambda c: c != 'g', ('lw', 'ms'): lambda lw, ms: lw < ms},
+    {('c', 'ms'): lambda c, ms: c == 'r' or ms == 2, 'lw': lambda lw: lw > 0},
+    {('c', 'lw', 'ms', 'ec'): lambda *v: v[1] == v[2]},
+    {'ec': lambda ec: ec == 'k'},
+    {'c': lambda c: c == 'nope'},
+])
+def test_where(predicates):
+    def keep(row):
+        return all(func(*(row[k] for k in (ks if isinstance(ks, tuple) else (ks,))))
+                   for ks, func in predicates.items())
+
+    for c in [
+        ((cycler(c='rgb') + cycler(ec='kyk'))
+         * cycler(lw=range(4)) * cycler(ms=range(4))),
+        (cycler(c='rgb') * cycler(lw=range(4)) * cycler(ms=range(4))
+         + cycler(ec='yk' * 24)),
+    ]:
+        target = [row for row in c if keep(row)]
+        filtered = c.where(predicates)
+        assert filtered.keys == c.keys
+        assert list(filtered) == target
+        assert len(filtered) == len(target)
+        assert filtered == c.where(keep)
+
+
+def test_where_pushdown():
+    calls = []
+    c = cycler(c='rgb') * cycler(lw=range(100))
+    filtered = c.where({'c': lambda c: calls.append(c) or c == 'r'})
+    # The predicate only sees the values of its key, not each row.
+    assert calls == list('rgb')
+    assert len(filtered) == 100
+    pytest.raises(KeyError, c.where, {'foo': bool})
+
+
+def test_where_change_key():
+    c = cycler(c='rgb') + cycler(lw=range(3))
+    filtered = c.where(lambda row: row['c'] != 'g')
+    filtered.change_key('c', 'color')
+    assert list(filtered) == [{'color': 'r', 'lw': 0}, {'color': 'b', 'lw': 2}]
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load(tmp_path, mmap):
+    c = ((cycler(c='rgb') + cycler(lw=[0.5, 1., 2.])) * cycler(ms=range(4))
+         * cycler(on=[True, False]) * cycler(big=[2**70, 1]))
+    c = c.where({'ms': lambda ms: ms > 0}).shuffled(seed=0) + cycler(
+        foo=[[i] for i in range(36)])
+    c.save(tmp_path / 'cyc')
+    loaded = Cycler.load(tmp_path / 'cyc', mmap=mmap)
+    assert loaded == c
+    assert loaded.by_key() == c.by_key()
+    assert loaded['lw'] == c['lw']
+    assert loaded.sample(3, seed=1) == c.sample(3, seed=1)
+    assert {p.name for p in (tmp_path / 'cyc').iterdir()} == {
+        'cycler.pkl', '0.pkl', '1.npy', '2.npy', '3.npy', '4.pkl', '5.pkl'}
+    # Operations on loaded cyclers keep the columns mapped.
+    loaded.change_key('lw', 'linewidth')
+    assert loaded['linewidth'] == c['lw']
+    composed = cycler(loaded) + cycler(x=range(36))
+    assert composed['linewidth'] == c['lw']
+
+
+def test_save_over_mapped(tmp_path):
+    path = tmp_path / 'cyc'
+    cycler(a=[0.5, 1.0, 2.0] * 1000).save(path)
+    mapped = Cycler.load(path)
+    (cycler(x=[1.5] * 10) + mapped[:10]).save(path)
+    # The loaded cycler keeps the values it mapped.
+    assert mapped['a'][:3] == [0.5, 1.0, 2.0]
+    assert len(mapped) == 3000
+    assert Cycler.load(path)['a'][:3] == [0.5, 1.0, 2.0]
+    assert Cycler.load(path)['x'][:3] == [1.5] * 3
+    assert not list(path.glob('*.tmp'))
+
+
+def test_load_npy_readable(tmp_path):
+    np = pytest.importorskip('numpy')
+    cycler(a=range(5)).save(tmp_path)
+    assert np.load(tmp_path / '0.npy').tolist() == list(range(5))
+
+
+def test_write_csv_jsonl():
+    import csv
+    import io
+    import json
+
+    c = cycler(c='rgb') * cycler(lw=range(3)) * cycler(ls=['-', ':'])
+    f = io.StringIO(newline='')
+    assert c.write_csv(f, chunksize=4) == len(c)
+    f.seek(0)
+    rows = list(csv.reader(f))
+    assert rows[0] == ['c', 'ls', 'lw']
+    assert rows[1:] == [[d['c'], d['ls'], str(d['lw'])] for d in c]
+
+    f = io.StringIO()
+    assert c.write_jsonl(f, keys=['lw', 'c', 'ls'], chunksize=5) == len(c)
+    lines = f.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == list(c)
+    assert lines[0] == '{"lw": 0, "c": "r", "ls": "-"}'
+
+    pytest.raises(ValueError, c.write_csv, f, keys=['c'])
+
+
+def test_to_from_pandas():
+    pd = pytest.importorskip('pandas')
+    c = cycler(c='rgb') * cycler(lw=range(3))
+    df = c.to_pandas()
+    assert list(df.columns) == ['c', 'lw']
+    assert df.equals(pd.DataFrame(list(c))[['c', 'lw']])
+    assert Cycler.from_frame(df) == c
+    assert list(c.to_pandas(keys=['lw', 'c']).columns) == ['lw', 'c']
+    with pytest.raises(ValueError, match='duplicate columns'):
+        Cycler.from_frame(pd.DataFrame([[1, 2]], columns=['a', 'a']))
+
+
+def test_to_from_arrow():
+    pa = pytest.importorskip('pyarrow')
+    c = cycler(c='rgb') * cycler(lw=range(3))
+    table = c.to_arrow()
+    assert table.equals(pa.Table.from_pylist(list(c)))
+    assert Cycler.from_frame(table) == c
+    with pytest.raises(ValueError, match='duplicate columns'):
+        Cycler.from_frame(pa.table([[1], [2]], names=['a', 'a']))
+    with pytest.raises(ValueError, match='same str'):
+        (cycler(1, [1]) + cycler('1', [2])).to_arrow()
+
+
+def test_multi_key_leaf_repr():
+    c = Cycler([{'a': 1, 'b': 2}, {'a': 3, 'b': 4}])
+    assert repr(c) == "(cycler('a', [1, 3]) + cycler('b', [2, 4]))" or \
+        repr(c) == "(cycler('b', [2, 4]) + cycler('a', [1, 3]))"
+
+
+def test_copy_constant_time():
+    from cycler import instrument
+
+    big = cycler(a=range(10**5)) * cycler(b=range(10))
+    other = cycler(z=range(10**6))
+    with instrument() as stats:
+        c = cycler(big)
+        d = big * cycler(q='xy')
+        e = cycler('A', cycler(a=range(10)))
+        c += other
+        f = 3 * big
+    assert stats.counts['rows'] == 0
+    assert stats.counts['dicts'] == 0
+    assert stats.counts['node'] < 20
+    # The leaf values are shared, not copied ...
+    assert c._left._left._left._left is big._left._left
+    # ... until renamed.
+    c.change_key('a', 'A')
+    assert big.keys == {'a', 'b'}
+    assert c.keys == {'A', 'b', 'z'}
+    assert next(islice(big.select('a'), 10, None)) == {'a': 1}
+    assert next(islice(c.select('A'), 10, None)) == {'A': 1}
+    assert d.keys == {'a', 'b', 'q'}
+    assert e == cycler(A=range(10))
+    assert len(f) == 3 * len(big)
+
+
+@pytest.mark.parametrize('values, encoding', [
+    (list(range(100)), list),
+    (['-', '--', ':'] * 1000, '_DictColumn'),
+    ([1] * 500 + [2] * 500 + [True] * 10, '_RunColumn'),
+    ([0.0] * 20 + [-0.0] * 20 + [float('nan')] * 20, '_RunColumn'),
+    ([[1], [2]] * 8, '_DictColumn'),
+    ([[1], [2]] + [[1], [2]] * 8, '_DictColumn'),
+    ([[i] for i in range(20)], list),
+    ([x for x in ([1], [2]) for _ in range(50)], '_RunColumn'),
+])
+def test_encoded_leaves(values, encoding):
+    c = cycler(c=values)
+    column = c._left.columns[0]
+    assert type(column).__name__ == (
+        encoding if isinstance(encoding, str) else encoding.__name__)
+    assert len(c) == len(values)
+    assert all(a['c'] is b for a, b in zip(c, values)
+               if not isinstance(b, (int, str)))
+    assert [repr(row['c']) for row in c] == list(map(repr, values))
+    assert [repr(v) for v in c['c']] == list(map(repr, values))
+    assert [repr(c._row(i)['c']) for i in range(len(c))] == list(map(repr, values))
+    assert c.by_key()['c'] == values or encoding == '_RunColumn'
+
+
+def test_encoded_leaves_memory():
+    values = [f'C{i}' for i in range(10)] * 10_000
+    c = cycler(color=values)
+    column = c._left.columns[0]
+    # One byte per entry instead of an 8 byte reference (and a dict).
+    assert sys.getsizeof(column.codes) < 2 * len(values)
+    assert len(column.table) == 10
+    assert c['color'] == values
+
+
+def test_memory_usage():
+    small = cycler(c='rgb') * cycler(lw=range(3))
+    big = cycler(c='rgb') * cycler(lw=range(3000))
+    assert 0 < small.memory_usage() < big.memory_usage()
+    assert big.memory_usage() < big.memory_usage(deep=True)
+    # Repetitive values are cheap to store.
+    assert cycler(c=['r', 'g'] * 5000).memory_usage() < 1000 + 2 * 10000
+
+    c = cycler(c='rgb') + cycler(lw=range(3))
+    lines = c.describe().splitlines()
+    assert lines[0].startswith("zip keys=['c', 'lw'] len=3")
+    assert lines[1].startswith("  leaf keys=['c'] len=3")
+    assert lines[-1].startswith('total ')
+    assert '3 nodes, depth 2, 0 B in shared storage' in lines[-1]
+
+
+def test_memory_usage_shared():
+    a = cycler(c=range(1000))
+    both = a + cycler(lw=range(1000))
+    both = both + cycler('e', a)
+    assert 'shared' in both.describe()
+    # Shared storage is only counted once.
+    unshared = (cycler(c=range(1000)) + cycler(lw=range(1000))
+                + cycler(e=range(1000)))
+    assert both.memory_usage() < unshared.memory_usage()
+    assert '0 B in shared storage' in unshared.describe()
+
+
+def test_memory_usage_shared_copy():
+    from cycler._columns import _ColumnRows
+
+    a = cycler(c=range(1000))
+    b = cycler(a)
+    b += cycler(lw=range(1000))
+    lines = b.describe().splitlines()
+    assert [line.endswith(', shared)') for line in lines if 'leaf' in line] \
+        == [True, False]
+    assert '0 B in shared storage' not in lines[-1]
+    # Columns are shared with the cycler renamed from.
+    d = Cycler._from_parts(
+        _ColumnRows(['c'], [list(range(1000))]), None, None, {'c'})
+    e = cycler(d)
+    e.change_key('c', 'e')
+    assert 'shared)' in e.describe()
+    del a, d
+    assert '0 B in shared storage' in b.describe()
+    assert '0 B in shared storage' in e.describe()
+
+
+@pytest.mark.parametrize('make', [
+    lambda: cycler(c='rgb') * (cycler(lw=range(3)) + cycler(ls='-:.')),
+    lambda: (cycler(c='rgb') * cycler(lw=range(4)))[1:10:2],
+    lambda: (cycler(c='rgb') + cycler(lw=range(3))) * 3,
+    lambda: cycler(c='rg') * cycler(lw=range(3)) * cycler(a=[None] * 20),
+    lambda: Cycler([{'x': 1, 'y': 2}, {'x': 3, 'y': 4}]) * cycler(c='rgb'),
+    lambda: cycler(c='rgb') * cycler(lw=range(4)).shuffled(seed=1),
+    lambda: (cycler(c='rgb') * cycler(lw=range(4)))[::-1],
+    lambda: cycler(c='rgb') * cycler(lw=[])[:0],
+    lambda: Cycler(cycler(c='rgbk'), cycler(lw='xyz'), zip),
+])
+def test_iter_columns(make):
+    c = make()
+    rows = list(c._iter_rows())
+    assert list(c) == rows
+    assert [list(row) for row in c] == [list(row) for row in rows]
+    # Rows are new dicts every time.
+    first = next(iter(c), None)
+    if first is not None:
+        first.clear()
+        assert list(c) == rows
+
+
+def test_extend():
+    import copy as copy_module
+
+    c = cycler(c='rgb')
+    copy = Cycler(c)
+    composed = c * cycler(lw=[1, 2])
+    c.append({'c': 'k'})
+    c.extend(cycler(c='cm'))
+    assert c == cycler(c='rgbkcm')
+    # Copies and compositions are not affected.
+    assert copy == cycler(c='rgb')
+    assert composed == cycler(c='rgb') * cycler(lw=[1, 2])
+    # Nor are copies made after extending.
+    copy = Cycler(c)
+    c.append({'c': 'y'})
+    assert len(copy) == 6 and len(c) == 7
+    copied = copy_module.copy(c)
+    c.append({'c': 'k'})
+    assert len(copied) == 7 and len(c) == 8
+
+    zipped = cycler(c='rg') + cycler(lw=[1, 2]) + cycler(ls=['-', ':'])
+    zipped.extend([{'c': 'b', 'lw': 3, 'ls': '--'}])
+    assert zipped == (cycler(c='rgb') + cycler(lw=[1, 2, 3])
+                      + cycler(ls=['-', ':', '--']))
+    copied = copy_module.copy(zipped)
+    zipped.append({'c': 'k', 'lw': 4, 'ls': '-.'})
+    assert len(copied) == 3 and len(zipped) == 4
+
+    # Encoded columns are decoded into a list.
+    long = cycler(c='r' * 100)
+    long.append({'c': 'g'})
+    assert long[-2:] == cycler(c='rg')
+
+
+def test_extend_index():
+    c = cycler(c='rgb')
+    c.append({'c': 'k'})
+    assert c.index({'c': 'k'}) == 3
+    index = c._value_index[2]
+    c.extend([{'c': 'r'}, {'c': 'c'}])
+    # Updated in place.
+    assert c._value_index[2] is index
+    assert c.count({'c': 'r'}) == 2
+    assert c.index({'c': 'c'}) == 5
+    c.append({'c': []})
+    assert c.index({'c': []}) == 6
+
+
+@pytest.mark.parametrize('c, row, match', [
+    (cycler(c='rg') * cycler(lw=[1, 2]), {'c': 'b', 'lw': 1}, 'Can only extend'),
+    (cycler(c='rgb').shuffled(seed=0), {'c': 'b'}, 'Can only extend'),
+    (cycler(c='rg') + cycler(lw=[1, 2]), {'c': 'b'}, 'do not match'),
+    (cycler(c='rg'), {'c': 'b', 'lw': 1}, 'do not match'),
+])
+def test_extend_errors(c, row, match):
+    before = list(c)
+    with pytest.raises(ValueError, match=match):
+        c.append(row)
+    assert list(c) == before
+
+
+@pytest.mark.parametrize('make', [
+    lambda: cycler(c='rgb'),
+    lambda: cycler(c='rgb') * (cycler(lw=range(3)) + cycler(ls='-:.')),
+    lambda: ((cycler(c='rg') * cycler(lw=range(3)))
+             * (cycler(a=[0, 1]) * cycler(b='xyz'))),
+    lambda: (cycler(c='rgb') + cycler(lw=range(3))) * 3 * cycler(a=[0, 1]),
+    lambda: (cycler(c='rgb') * cycler(lw=range(4)) * cycler(a='xy')).drop('lw'),
+    lambda: cycler(c='rgb') * cycler(lw=range(4)).shuffled(seed=1),
+    lambda: (cycler(c='rgb') * cycler(lw=range(4))).where({'lw': lambda v: v % 2}),
+    lambda: (Cycler(cycler(c='rgbk') * cycler(a='xy'), cycler(lw='xyz'), zip)
+             * cycler(b='uv')),
+    lambda: Cycler([{'x': 1, 'y': 2}, {'x': 3, 'y': 4}]) * cycler(c='rgb'),
+    lambda: cycler(c='rgb') * cycler(lw=[]),
+    lambda: cycler(c=[]) * 2 * 2,
+    lambda: cycler(c='rg') * (cycler(lw=[1]) * cycler(a=[])),
+])
+def test_row_views(make):
+    c = make()
+    views = list(c.row_views())
+    assert views == list(c)
+    assert [list(view) for view in views] == [list(row) for row in c]
+
+
+def test_row_view_mapping():
+    from collections.abc import Mapping
+
+    view = next((cycler(c='rgb') * cycler(lw=[1, 2])).row_views())
+    assert isinstance(view, Mapping)
+    assert dict(**view) == {'c': 'r', 'lw': 1}
+    assert view.get('ls') is None
+    assert 'lw' in view and 'ls' not in view
+    assert repr(view) == "RowView({'c': 'r', 'lw': 1})"
+    with pytest.raises(KeyError):
+        view['ls']
+    with pytest.raises(TypeError):
+        view['c'] = 'k'
+
+
+def _replay(deltas):
+    rows = []
+    row = {}
+    for delta in deltas:
+        row = {**row, **delta}
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize('make', [
+    lambda: cycler(c='rgb'),
+    lambda: cycler(c='rgb') * (cycler(lw=range(3)) + cycler(ls='-:.')),
+    lambda: ((cycler(c='rg') * cycler(lw=range(3)))
+             * (cycler(a=[0, 1]) * cycler(b='xyz'))),
+    lambda: (cycler(c='rgb') + cycler(lw=range(3))) * 3 * cycler(a=[0, 1]),
+    lambda: cycler(c='rgb') * cycler(lw=range(4)).shuffled(seed=1),
+    lambda: (cycler(c='rgb') * cycler(lw=range(4))).where({'lw': lambda v: v % 2}),
+    lambda: (Cycler(cycler(c='rgbk') * cycler(a='xy'), cycler(lw='xyz'), zip)
+             * cycler(b='uv')),
+    lambda: cycler(c='r') * cycler(lw=range(3)),
+    lambda: cycler(c='rgb') * cycler(lw=[]),
+    lambda: cycler(c=[]) * 2 * 2,
+    lambda: cycler(c='rg') * (cycler(lw=[1]) * cycler(a=[])),
+])
+def test_iter_deltas(make):
+    c = make()
+    deltas = list(c.iter_deltas())
+    assert _replay(deltas) == list(c)
+
+
+def test_iter_deltas_product():
+    c = cycler(a=range(2)) * cycler(b=range(3)) * cycler(c='xyzw')
+    deltas = list(c.iter_deltas())
+    assert [len(d) for d in deltas[:13]] == [3, 1, 1, 1, 2, 1, 1, 1, 2, 1, 1, 1, 3]
+    assert deltas[12] == {'a': 1, 'b': 0, 'c': 'x'}
+
+
+@pytest.mark.parametrize('make', [
+    lambda: cycler(c='rgb'),
+    lambda: cycler(a=range(2)) * cycler(b=range(3)) * cycler(c='xyzw'),
+    lambda: cycler(c='rgb') * (cycler(lw=range(3)) + cycler(ls='-:.')) * cycler(a='x'),
+    lambda: ((cycler(c='rg') * cycler(lw=range(3)))
+             * (cycler(a=[0, 1]) * cycler(b='xyz'))),
+    lambda: cycler(c='rgb') * cycler(lw=[]),
+    lambda: cycler(c='rg') * (cycler(lw=[1]) * cycler(a=[])),
+])
+def test_iter_deltas_gray(make):
+    c = make()
+    deltas = list(c.iter_deltas(gray=True))
+    rows = _replay(deltas)
+    assert sorted(map(repr, rows)) == sorted(map(repr, c))
+    # Exactly one leaf changes at each step.
+    leaves = {frozenset(['lw', 'ls'])}
+    for delta in deltas[1:]:
+        assert len(delta) == 1 or set(delta) in leaves
+
+
+@pytest.mark.parametrize('c', [
+    cycler(c='rgb') * cycler(lw=range(4)).shuffled(seed=1),
+    (cycler(c='rgb') * cycler(lw=range(4))) + cycler(a=range(12)),
+])
+def test_iter_deltas_gray_error(c):
+    with pytest.raises(ValueError, match='Gray code'):
+        c.iter_deltas(gray=True)
+
+
+def test_map_parallel_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    c = cycler(a=range(10)) * cycler(b=range(7))
+    expected = [row['a'] * row['b'] for row in c]
+    with ThreadPoolExecutor(4) as executor:
+        out = c.map_parallel(lambda row: row['a'] * row['b'], executor, chunksize=3)
+        assert list(out) == expected
+        out = c.map_parallel(lambda row: row['a'] * row['b'], executor,
+                             chunksize=3, ordered=False)
+        assert sorted(out) == sorted(expected)
+
+
+def test_map_parallel_processes():
+    from operator import itemgetter
+
+    c = cycler(a=range(10)) * cycler(b='xyz')
+    assert list(c.map_parallel(itemgetter('b'), chunksize=4)) == list('xyz') * 10
+
+
+def test_map_parallel_sends_tree_once(monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor
+    from operator import itemgetter
+
+    from cycler import _parallel
+
+    class Recorder(ProcessPoolExecutor):
+        def submit(self, fn, *args):
+            trees.append(args[0])
+            return super().submit(fn, *args)
+
+    trees = []
+    monkeypatch.setattr(_parallel, 'ProcessPoolExecutor', Recorder)
+    c = cycler(a=range(10)) * cycler(b='xyz')
+    assert list(c.map_parallel(itemgetter('a'), chunksize=4)) == [
+        row['a'] for row in c]
+    # The default pool's workers get the tree when they start, not per task.
+    assert len(trees) == 8 and all(payload is None for _, payload in trees)
+    with Recorder(2) as executor:
+        trees.clear()
+        assert list(c.map_parallel(itemgetter('b'), executor, chunksize=10)) == [
+            row['b'] for row in c]
+    assert all(isinstance(payload, bytes) for _, payload in trees)
+
+
+def test_map_parallel_backpressure():
+    from concurrent.futures import ThreadPoolExecutor
+
+    class Recorder(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args)
+            return super().submit(fn, *args)
+
+    submitted = []
+    c = cycler(a=range(100))
+    with Recorder(2) as executor:
+        out = c.map_parallel(lambda row: row['a'], executor, chunksize=10,
+                             max_in_flight=3)
+        assert not submitted
+        assert next(out) == 0
+        assert len(submitted) == 3
+        assert list(out) == list(range(1, 100))
+    # Ranges of rows are sent, not the rows.
+    assert [args[2:] for args in submitted] == [(i, i + 10) for i in range(0, 100, 10)]
+
+    with pytest.raises(ValueError):
+        c.map_parallel(len, chunksize=0)
+    with pytest.raises(ValueError):
+        c.map_parallel(len, max_in_flight=0)
+
+
+def test_shared_cycle():
+    from concurrent.futures import ThreadPoolExecutor
+
+    c = cycler(c='rgb') * cycler(lw=range(5))
+    styles = c.shared_cycle()
+    assert iter(styles) is styles
+    assert list(islice(styles, 20)) == list(c) + list(c)[:5]
+    assert styles.position == 5
+    styles.reset(-1)
+    assert next(styles) == {'c': 'b', 'lw': 4}
+    # Extending the cycler does not change the cycle.
+    grown = cycler(c='rg')
+    styles = grown.shared_cycle()
+    grown.append({'c': 'b'})
+    assert list(islice(styles, 4)) == [{'c': 'r'}, {'c': 'g'}] * 2
+
+    styles = c.shared_cycle()
+    with ThreadPoolExecutor(8) as executor:
+        rows = list(executor.map(lambda _: next(styles), range(15 * 100)))
+    # Every row handed out exactly once per cycle.
+    counts = {}
+    for row in rows:
+        key = tuple(row.items())
+        counts[key] = counts.get(key, 0) + 1
+    assert set(counts.values()) == {100} and len(counts) == 15
+
+    for empty in [cycler(c=[]), cycler(c=[]) * 2 * 2,
+                  cycler(c='rg') * (cycler(lw=[1]) * cycler(a=[]))]:
+        with pytest.raises(StopIteration):
+            next(empty.shared_cycle())
+
+
+def test_aiter():
+    import asyncio
+
+    c = cycler(c='rgb') * cycler(lw=range(500))
+
+    async def collect():
+        rows = [row async for row in c]
+        batches = [batch async for batch in c.aiter_batches(700)]
+        return rows, batches
+
+    rows, batches = asyncio.run(collect())
+    assert rows == list(c)
+    assert [len(b) for b in batches] == [700, 700, 100]
+    assert sum(batches, []) == rows
+    with pytest.raises(ValueError):
+        c.aiter_batches(0)
+
+
+def test_aiter_yields_to_loop():
+    import asyncio
+
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        n = 0
+        async for _ in cycler(x=range(10 * 1024)):
+            n += 1
+        task.cancel()
+        return n
+
+    assert asyncio.run(main()) == 10 * 1024
+    assert len(ticks) >= 10
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_amap(ordered):
+    import asyncio
+
+    running = 0
+    peak = 0
+
+    async def work(row):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # Later rows finish first.
+        await asyncio.sleep(0.001 * (20 - row['x']) / 20)
+        running -= 1
+        return row['x']
+
+    async def main():
+        return [r async for r in cycler(x=range(20)).amap(work, 4, ordered)]
+
+    out = asyncio.run(main())
+    assert peak == 4
+    if ordered:
+        assert out == list(range(20))
+    else:
+        assert sorted(out) == list(range(20))
+    with pytest.raises(ValueError):
+        cycler(x=range(20)).amap(work, 0)
+
+
+def test_amap_cancel():
+    import asyncio
+
+    started = []
+    cancelled = []
+
+    async def work(row):
+        started.append(row['x'])
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(row['x'])
+            raise
+
+    async def main():
+        results = cycler(x=range(100)).amap(work, 3)
+        task = asyncio.ensure_future(results.__anext__())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert sorted(started) == [0, 1, 2]
+    assert sorted(cancelled) == [0, 1, 2]
+
+
+@pytest.mark.parametrize('text', [
+    "cycler('color', 'rgb')",
+    "cycler(color=['r', 'g', 'b'], lw=[1, 2, 3])",
+    "cycler('color', ['r', 'g']) * cycler(lw=[1, 2])",
+    "(cycler(c='rg') + cycler(lw=[1, 2])) * 2",
+    "3 * cycler(c=[-1, 2.5, None])",
+    "concat(cycler(c='rg'), cycler(c='b'))",
+    "cycler(c='rg').concat(cycler(c='b'))",
+    "cycler(c='rgbk')[::-2] * cycler(1, (1, 2))",
+    "cycler('c', cycler(d='rgb'))",
+    """
+    cycler(color=['r', 'g'])
+    + cycler(ls=['-', ':'])
+    """,
+])
+def test_parse(text):
+    from cycler import parse
+
+    assert parse(text) == eval(f"({text})")
+
+
+def test_parse_cache():
+    from cycler import parse
+    from cycler._parse import _parse
+
+    text = "cycler(c='rgb') * cycler(lw=[1, 2])"
+    first = parse(text)
+    hits = _parse.cache_info().hits
+    second = parse(text)
+    assert _parse.cache_info().hits == hits + 1
+    assert first == second and first is not second
+    # The cached cycler is not modified through the copies.
+    first.change_key('c', 'color')
+    assert parse(text).keys == {'c', 'lw'}
+
+
+@pytest.mark.parametrize('text, match', [
+    ("__import__('os').system('true')", 'Unsupported call'),
+    ("cycler(c=open('f'))", 'Unsupported call'),
+    ("cycler(c=[x for x in 'ab'])", 'Unsupported argument'),
+    ("cycler(c='rg').__class__", 'Unsupported syntax'),
+    ("cycler(c='rg') - cycler(c='rg')", 'Unsupported operator'),
+    ("cycler(c='rg')[0]", 'Only slices'),
+    ("cycler(**{'c': 'rg'})", r'Unsupported \*\* argument'),
+    ("1 + 2", 'Expected a cycler'),
+    ("[1, 2]", 'Unsupported syntax'),
+    ("cycler(c='rg'", 'Invalid cycler expression'),
+    ("cycler(1, 2)", 'Invalid arguments'),
+    ("cycler(c='rg')[cycler(c='a'):]", 'Slice bounds'),
+    ("concat(cycler(c='a') * 1000000000, cycler(c='b'))", 'Multiplier above'),
+    ("concat(cycler(c='a') * 1000000, cycler(c='b'))", 'Copy of more than'),
+    ("cycler('c', cycler(a='ab') * cycler(b='ab') * 300000)", 'Copy of more than'),
+])
+def test_parse_errors(text, match):
+    from cycler import parse
+
+    with pytest.raises(ValueError, match=match):
+        parse(text)
+
+
+def test_view_transforms():
+    c = cycler(c='rgbk') * cycler(lw=range(3))
+    rows = list(c)
+    n = len(rows)
+    assert list(reversed(c)) == rows[::-1]
+    assert list(c.step(5)) == rows[::5]
+    assert list(c.step(-2)) == rows[::-2]
+    for k in (0, 1, 5, n, -1, -13, 2 * n + 3):
+        assert list(c.roll(k)) == [rows[(i - k) % n] for i in range(n)]
+    for start, stop in [(0, n), (3, 7), (10, 30), (-5, 2), (-30, -20), (5, 5), (5, 2)]:
+        window = c.window(start, stop)
+        assert list(window) == [rows[i % n] for i in range(start, stop)]
+        assert len(window) == max(stop - start, 0)
+    assert len(cycler(c=[]).window(2, 5)) == 0
+    empty = cycler(c='rg') * (cycler(lw=[1]) * cycler(a=[]))
+    assert list(reversed(empty)) == list(empty.shuffled(1)) == []
+    assert list(empty.roll(1)) == list((cycler(c=[]) * 2 * 2).step(-1)) == []
+    with pytest.raises(ValueError):
+        c.step(0)
+
+    # Composable, with random access and lookups.
+    composed = c.roll(4).window(2, 20).step(3)[1:]
+    expected = [rows[(i - 4) % n] for i in range(n)]
+    expected = [expected[i % n] for i in range(2, 20)][::3][1:]
+    assert list(composed) == expected
+    assert len(composed) == len(expected)
+    assert composed[2:4] == cycler(c=[r['c'] for r in expected[2:4]]) + cycler(
+        lw=[r['lw'] for r in expected[2:4]])
+    assert composed.index(expected[2]) == expected.index(expected[2])
+    assert list(composed.row_views()) == expected
+
+
+def test_view_transforms_are_lazy():
+    from cycler import instrument
+
+    c = cycler(c='rgb') * cycler(lw=range(1000))
+    with instrument() as stats:
+        views = [c[::-1], c.roll(7), c.step(3), c.window(5, 5000), c[10:][::2]]
+    assert not stats.counts['by_key'] and not stats.counts['rows']
+    assert [len(v) for v in views] == [3000, 3000, 1000, 4995, 1495]
+    # Slices of slices are a single view of the source.
+    assert c[10:][::2][3:]._left._left is c._left
+    # Rows far into the source are computed directly, not by skipping to them.
+    big = cycler(a=range(10**5)) * cycler(b=range(10**4))
+    n = len(big)
+    assert list(big[-2:]) == [{'a': 10**5 - 1, 'b': 10**4 - 2},
+                              {'a': 10**5 - 1, 'b': 10**4 - 1}]
+    assert list(big.window(n - 1, n + 1)) == [big[-1:]._row(0), big._row(0)]
+    assert list(big.step(10**8))[-1] == {'a': 90000, 'b': 0}
+
+
+@pytest.fixture
+def interning():
+    from cycler import set_interning
+
+    previous = set_interning(True)
+    yield
+    set_interning(previous)
+
+
+def test_interning(interning):
+    from cycler import instrument
+
+    palette = ['r', 'g', 'b']
+    a = cycler(color=palette) * cycler(lw=[1, 2])
+    b = cycler(color=list(palette)) * cycler(lw=[1, 2])
+    assert a is not b
+    assert a._left is b._left and a._right is b._right
+    with instrument() as stats:
+        assert a == b
+    assert not stats.counts['eq_scan']
+    # Data derived from shared parts is shared.
+    assert a.index({'color': 'g', 'lw': 2}) == 3
+    assert '_value_index' in b._left.__dict__
+    assert (a + cycler(ls='-:' * 3))._left is (b + cycler(ls='-:' * 3))._left
+    assert (a * 2)._left is (b * 2)._left
+
+    # Modifying an interned cycler does not affect the others.
+    a.change_key('color', 'c')
+    leaf = cycler(color=palette)
+    leaf.append({'color': 'k'})
+    assert b == cycler(color=palette) * cycler(lw=[1, 2])
+    assert cycler(color=palette) == cycler(color='rgb')
+
+    # Leaves are shared for as long as any cycler using them is alive.
+    x = cycler(color=palette)
+    assert x._left is cycler(color=palette)._left
+    with instrument() as stats:
+        assert x == cycler(color=list(palette))
+    assert not stats.counts['eq_scan']
+    # Values are compared by type.
+    ints = cycler(x=[1, 2])
+    assert ints._left is cycler(x=[1, 2])._left
+    assert ints._left is not cycler(x=[1.0, 2.0])._left
+    assert ints._left is not cycler(y=[1, 2])._left
+
+
+def test_interning_freed(interning):
+    import gc
+    from cycler._intern import _nodes
+
+    gc.collect()
+    before = len(_nodes)
+    c = cycler(z=[object(), object()]) * cycler(w='uvw')
+    assert len(_nodes) > before
+    del c
+    gc.collect()
+    assert len(_nodes) == before
+    leaf = cycler(z=[object()])
+    assert len(_nodes) > before
+    del leaf
+    gc.collect()
+    assert len(_nodes) == before
+
+
+def test_intern():
+    from cycler import intern
+
+    a = cycler(c='rgb') * cycler(lw=[1, 2])
+    b = cycler(c='rgb') * cycler(lw=[1, 2])
+    assert a._left is not b._left
+    ia, ib = intern(a), intern(b)
+    assert ia._left is ib._left and ia._right is ib._right
+    assert ia == a
+    # Shuffles are not interned, but still copied.
+    s = a.shuffled(seed=0)
+    assert intern(s) == s and intern(s) is not s
+    assert intern(s)._left is not intern(b.shuffled(seed=0))._left